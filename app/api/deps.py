@@ -5,12 +5,35 @@ This module provides reusable dependencies for API endpoints including
 database sessions, pagination parameters, and other common functionality.
 """
 
-from typing import Generator
-from fastapi import Depends, HTTPException, Query
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Generator, Optional
+from fastapi import Depends, HTTPException, Query, Request, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 
-from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.database import async_session_scope, get_session_factory
+from app.core.replicas import is_sticky, replica_session_scope
+
+
+def pool_exhausted_error() -> HTTPException:
+    """
+    Build the response for a request that could not get a pooled connection
+    
+    Returned when every connection stayed checked out for the whole pool
+    timeout (`settings.pool_wait_timeout`). The client is told to retry
+    instead of seeing a generic database error.
+    
+    Returns:
+        HTTPException: 503 with a Retry-After header
+    """
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Database connection pool exhausted, please retry",
+        headers={"Retry-After": str(settings.db_pool_retry_after_seconds)}
+    )
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -28,9 +51,11 @@ def get_db() -> Generator[Session, None, None]:
         def get_users(db: Session = Depends(get_db)):
             return db.query(User).all()
     """
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
+    except PoolTimeoutError:
+        raise pool_exhausted_error()
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(
@@ -41,6 +66,69 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency
+    
+    Provides a session for `async def` endpoints so database calls do not
+    block the event loop. Depending on `settings.database_async` this is a
+    native AsyncSession or the sync engine driven through the thread pool.
+    
+    Yields:
+        AsyncSession: Async SQLAlchemy database session
+        
+    Example:
+        @app.get("/users/")
+        async def get_users(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(User))
+            return result.scalars().all()
+    """
+    async with async_session_scope() as db:
+        try:
+            yield db
+        except PoolTimeoutError:
+            raise pool_exhausted_error()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=500,
+                detail=f"Database error: {str(e)}"
+            )
+
+
+@asynccontextmanager
+async def read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Open a session for reads that may be served by a read replica
+    
+    Clients that wrote within `settings.replica_sticky_seconds` read from
+    the primary so they see their own changes; without configured (or
+    usable) replicas this is a primary session. Errors are reported like
+    `get_async_db`. Open it only when needed (e.g. after a cache miss), so
+    requests answered without the database hold no pooled connection.
+    
+    Args:
+        request: Incoming request (its cookies carry the stickiness marker)
+        
+    Yields:
+        AsyncSession: Replica or primary session
+    """
+    try:
+        async with replica_session_scope(prefer_primary=is_sticky(request.cookies)) as db:
+            try:
+                yield db
+            except SQLAlchemyError as e:
+                if isinstance(e, PoolTimeoutError):
+                    raise
+                await db.rollback()
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Database error: {str(e)}"
+                )
+    except PoolTimeoutError:
+        raise pool_exhausted_error()
+
+
 def get_pagination_params(
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     size: int = Query(10, ge=1, le=100, description="Items per page (max 100)")
@@ -77,7 +165,25 @@ def get_pagination_params(
     }
 
 
-class CommonQueryParams:
+class SortParams:
+    """
+    Sorting query parameters
+    
+    Provides the field and direction used to order list results.
+    Endpoints are responsible for validating `order_by` against the
+    columns they allow sorting on and for choosing a default order.
+    """
+    
+    def __init__(
+        self,
+        order_by: Optional[str] = Query(None, description="Field to order by (endpoint default when omitted)"),
+        order_desc: bool = Query(False, description="Order in descending order")
+    ):
+        self.order_by = order_by
+        self.order_desc = order_desc
+
+
+class CommonQueryParams(SortParams):
     """
     Common query parameters for filtering and searching
     
@@ -92,20 +198,38 @@ class CommonQueryParams:
         order_by: str = Query("id", description="Field to order by"),
         order_desc: bool = Query(False, description="Order in descending order")
     ):
+        super().__init__(order_by=order_by, order_desc=order_desc)
         self.search = search
         self.active_only = active_only
-        self.order_by = order_by
-        self.order_desc = order_desc
 
 
-def check_database_connection(db: Session = Depends(get_db)) -> bool:
+class BookFilterParams:
+    """
+    Book filter query parameters
+    
+    The filter set shared by every endpoint that selects books by criteria
+    (listing, exporting, ...), so they all accept the same parameters.
+    """
+    
+    def __init__(
+        self,
+        curation_status: str = Query(None, description="Filter by curation status (pending, approved, rejected, archived)"),
+        search: str = Query(None, description="Search in title and author fields"),
+        is_active: bool = Query(True, description="Filter by active status (default: only active books)")
+    ):
+        self.curation_status = curation_status
+        self.search = search
+        self.is_active = is_active
+
+
+async def check_database_connection(db: AsyncSession = Depends(get_async_db)) -> bool:
     """
     Database connection health check dependency
     
     Verifies that the database connection is working properly.
     
     Args:
-        db: Database session
+        db: Async database session
         
     Returns:
         bool: True if database is connected and responsive
@@ -115,11 +239,12 @@ def check_database_connection(db: Session = Depends(get_db)) -> bool:
     """
     try:
         # Simple query to test database connection
-        from sqlalchemy import text
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return True
+    except PoolTimeoutError:
+        raise pool_exhausted_error()
     except Exception as e:
         raise HTTPException(
             status_code=503,
             detail=f"Database connection failed: {str(e)}"
-        ) 
\ No newline at end of file
+        )
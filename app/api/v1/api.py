@@ -55,6 +55,7 @@ async def api_v1_info():
             "health_check": f"{settings.api_v1_str}/health",
             "simple_health": f"{settings.api_v1_str}/health/simple", 
             "database_health": f"{settings.api_v1_str}/health/database",
+            "cache_stats": f"{settings.api_v1_str}/health/cache",
             "books": f"{settings.api_v1_str}/books"
         },
         "features": [
@@ -5,17 +5,102 @@ This module provides comprehensive REST API endpoints for managing books,
 including Create, Read, Update, and Delete operations.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import Session
+import csv
+import io
+from datetime import datetime
+from typing import Any, Dict, List, Literal, NamedTuple, Optional, Tuple, Union
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import false, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.core.cache import book_cache
+from app.core.coalescing import GET_BOOK, LIST_BOOKS, book_read_flights
+from app.core.conditional import (
+    collection_etag,
+    entity_etag,
+    etag_matches_none_match,
+    http_date,
+    not_modified_since,
+    parse_entity_etag,
+)
+from app.core.config import settings
+from app.core.counting import CountStrategy, count_rows
+from app.core.database import async_session_scope
+from app.core.encoding import JSON_MEDIA_TYPE, dumps as encode_json
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.core.replicas import is_replica_session, is_sticky
+from app.core.search import SearchClause, books_fts, build_search
 from app.models.book import Book as BookModel
-from app.schemas.book import Book as BookSchema, BookCreate, BookUpdate
+from app.schemas.base import PaginatedResponse
+from app.schemas.book import (
+    Book as BookSchema,
+    BookBulkChangeResult,
+    BookBulkItemResult,
+    BookBulkResult,
+    BookBulkSelection,
+    BookBulkStatusUpdate,
+    BookCreate,
+    BookImportRejection,
+    BookImportResult,
+    BookUpdate,
+)
+from app.services.book_import import import_books as import_books_from_records, parse_csv, parse_ndjson
+from app.services.books import format_validation_error, insert_books_batched, update_books_chunked
 
 router = APIRouter()
 
+# Paths (relative to this router) of the POST endpoints that honor an
+# Idempotency-Key header; see app.core.idempotency
+IDEMPOTENT_PATHS = ("/", "/bulk", "/bulk/status", "/bulk/delete")
+
+# Fields clients may order book lists by. Each one has its own index, and
+# `id` is always added as a tiebreaker so `(sort_key, id)` is a total order
+# that cursor pagination can seek into.
+SORTABLE_COLUMNS = {
+    "id": BookModel.id,
+    "title": BookModel.title,
+    "author": BookModel.author,
+    "curation_status": BookModel.curation_status,
+}
+
+# Pseudo sort field ordering search results by match quality
+RELEVANCE = "relevance"
+
+# Public `BookSchema` fields, in schema order. List and export responses
+# select exactly these columns and encode them without building models.
+BOOK_FIELDS = tuple(BookSchema.model_fields)
+
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class CachedBook(NamedTuple):
+    """
+    A book as stored in `book_cache`: its response body plus validators
+    """
+    
+    data: Dict[str, Any]
+    payload: bytes
+    etag: str
+    last_modified: datetime
+    version: int
+
+
+class BooksPage(NamedTuple):
+    """
+    An encoded page of `get_books`, shared by identical concurrent requests
+    """
+    
+    content: bytes
+    has_more: bool
+    next_cursor: Optional[str]
+
 
 # CREATE - Add a new book
 @router.post(
@@ -26,16 +111,16 @@ router = APIRouter()
     description="Add a new book to the database.",
     tags=["Books"]
 )
-def create_book(
+async def create_book(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     book_in: BookCreate
 ) -> BookModel:
     """
     Create a new book record in the database.
 
     - **Args**:
-        - `db (Session)`: The database session, injected by FastAPI.
+        - `db (AsyncSession)`: The async database session, injected by FastAPI.
         - `book_in (BookCreate)`: The book data from the request body, validated by Pydantic.
 
     - **Returns**:
@@ -48,66 +133,599 @@ def create_book(
     db.add(db_book)
     
     # Commit the transaction to save the book to the database
-    db.commit()
+    await db.commit()
+    _forget_inflight_reads()
     
     # Refresh the instance to get the data back from the database,
     # including auto-generated fields like `id` and `created_at`.
-    db.refresh(db_book)
+    await db.refresh(db_book)
     
     return db_book
 
 
+# CREATE - Add many books in one request
+@router.post(
+    "/bulk",
+    response_model=BookBulkResult,
+    summary="Create books in bulk",
+    description=(
+        "Add many books in one request. Items are validated individually and "
+        "inserted in chunks with multi-row INSERT statements; the response "
+        "reports the outcome of every item."
+    ),
+    tags=["Books"],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/BookCreate"},
+                    }
+                }
+            },
+        }
+    },
+)
+async def create_books_bulk(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    items: List[Any] = Body(...)
+) -> BookBulkResult:
+    """
+    Create many book records with batched inserts.
+
+    Items are accepted as raw objects and validated one by one against
+    `BookCreate`, so invalid items are reported instead of failing the whole
+    request. Valid items are written `BULK_INSERT_CHUNK_SIZE` at a time, one
+    statement and one transaction per chunk.
+
+    - **Args**:
+        - `items`: Array of book objects in the `BookCreate` format
+
+    - **Returns**:
+        - `BookBulkResult`: Counts plus a per-item success or error entry
+
+    - **Raises**:
+        - `HTTPException 413`: If more than `BULK_MAX_ITEMS` items are sent
+    """
+    if len(items) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_max_items} books can be created per request"
+        )
+    
+    results: List[Optional[BookBulkItemResult]] = [None] * len(items)
+    valid_indexes: List[int] = []
+    valid_rows: List[Dict[str, Any]] = []
+    
+    # Validate every item on its own so one bad item does not reject the batch
+    for index, item in enumerate(items):
+        try:
+            book_in = BookCreate.model_validate(item)
+        except ValidationError as e:
+            results[index] = BookBulkItemResult(
+                index=index,
+                success=False,
+                error=format_validation_error(e)
+            )
+        else:
+            valid_indexes.append(index)
+            valid_rows.append(book_in.model_dump())
+    
+    outcomes = await insert_books_batched(db, valid_rows, settings.bulk_insert_chunk_size)
+    _forget_inflight_reads()
+    
+    for index, outcome in zip(valid_indexes, outcomes):
+        results[index] = BookBulkItemResult(
+            index=index,
+            success=outcome.book is not None,
+            book=BookSchema.model_validate(outcome.book) if outcome.book is not None else None,
+            error=outcome.error
+        )
+    
+    succeeded = sum(1 for result in results if result.success)
+    
+    return BookBulkResult(
+        total=len(items),
+        succeeded=succeeded,
+        failed=len(items) - succeeded,
+        items=results
+    )
+
+
+# CREATE - Import books from an NDJSON or CSV file
+@router.post(
+    "/import",
+    response_model=BookImportResult,
+    summary="Import books from a file",
+    description=(
+        "Upload an NDJSON or CSV file as the raw request body. Rows are parsed "
+        "and validated as the upload arrives and written in bounded batches, "
+        "so files of any size can be imported."
+    ),
+    tags=["Books"],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string", "format": "binary"}},
+                "text/csv": {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+async def import_books(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    request: Request,
+    import_format: Optional[Literal["ndjson", "csv"]] = Query(
+        None,
+        alias="format",
+        description="File format (default: inferred from Content-Type, falling back to NDJSON)"
+    )
+) -> BookImportResult:
+    """
+    Import books from a streamed NDJSON or CSV upload.
+
+    The body is read chunk by chunk; each row is validated against
+    `BookCreate` and accepted rows are written `IMPORT_BATCH_SIZE` at a
+    time (COPY on PostgreSQL). CSV files need a header row with at least
+    `title`, `author` and `source_url`.
+
+    - **Args**:
+        - `format`: `ndjson` or `csv`
+
+    - **Returns**:
+        - `BookImportResult`: Accepted and rejected counts with rejected line numbers
+    """
+    if import_format is None:
+        content_type = request.headers.get("content-type", "")
+        import_format = "csv" if content_type.startswith("text/csv") else "ndjson"
+    
+    parse = parse_csv if import_format == "csv" else parse_ndjson
+    
+    summary = await import_books_from_records(
+        db,
+        parse(request.stream(), max_record_bytes=settings.import_max_record_bytes),
+        batch_size=settings.import_batch_size,
+        max_reported=settings.import_max_reported_rejections
+    )
+    _forget_inflight_reads()
+    
+    return BookImportResult(
+        accepted=summary.accepted,
+        rejected=summary.rejected,
+        rejected_rows=[
+            BookImportRejection(line=line, error=error)
+            for line, error in summary.rejected_rows
+        ],
+        truncated=summary.truncated
+    )
+
+
 # READ - Get all books with optional filtering
 @router.get(
     "/",
-    response_model=List[BookSchema],
+    response_model=Union[List[BookSchema], PaginatedResponse[BookSchema]],
     summary="Get all books",
-    description="Retrieve a list of all books with optional filtering by status and search terms.",
+    description=(
+        "Retrieve a list of all books with optional filtering by status and search terms. "
+        "When more results are available, the `X-Next-Cursor` response header carries "
+        "a cursor that can be passed back as `after` to fetch the next page. "
+        "With `envelope=true` the page is wrapped with `total`/`pages`, counted "
+        "with the selected `count` strategy."
+    ),
+    responses={304: {"description": "The page has not changed"}},
     tags=["Books"]
 )
-def get_books(
+async def get_books(
     *,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    sort: deps.SortParams = Depends(),
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    curation_status: str = Query(None, description="Filter by curation status (pending, approved, rejected, archived)"),
-    search: str = Query(None, description="Search in title and author fields"),
-    is_active: bool = Query(True, description="Filter by active status (default: only active books)")
-) -> List[BookModel]:
+    after: Optional[str] = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)"),
+    envelope: bool = Query(False, description="Wrap the page with total/page/pages information"),
+    count: CountStrategy = Query(CountStrategy.exact, description="How the envelope total is counted"),
+    filters: deps.BookFilterParams = Depends(),
+    if_none_match: Optional[str] = Header(None, description="ETag(s) of the page the client holds")
+) -> Response:
     """
     Retrieve books with optional filtering and pagination.
 
+    Two pagination modes are supported:
+    - Offset mode (`skip`/`limit`): simple, but each page costs as much as
+      all the pages before it because skipped rows are still scanned.
+    - Cursor mode (`after`/`limit`): seeks directly to the position encoded
+      in the cursor, so every page costs the same regardless of depth.
+
+    Identical requests arriving while a page is being loaded wait for that
+    load instead of querying again (see `app.core.coalescing`); the session
+    is opened by the load, so waiting requests hold no pooled connection.
+
     - **Args**:
+        - `order_by`: Field to order by (`id`, `title`, `author`, `curation_status`,
+          or `relevance` when searching). Defaults to `relevance` when `search`
+          is given, otherwise `id`.
+        - `order_desc`: Order in descending order (ignored for `relevance`)
         - `skip`: Number of records to skip (for pagination)
         - `limit`: Maximum number of records to return
+        - `after`: Cursor returned in the `X-Next-Cursor` header of the previous page
+        - `fields`: Comma-separated `BookSchema` fields to return, e.g. `id,title`.
+          Only these columns (plus the sort key) are selected from the database.
+        - `envelope`: Return a `PaginatedResponse` instead of a bare list
+        - `count`: Envelope total strategy: `exact` (COUNT(*)), `estimated`
+          (planner estimate; exact on non-PostgreSQL databases) or `cached`
+          (exact count reused per filter combination for COUNT_CACHE_TTL_SECONDS).
+          The envelope's `count_strategy` says which one produced the total.
         - `curation_status`: Filter by specific curation status
-        - `search`: Search term for title and author
+        - `search`: Search term for title and author, served by the search
+          index of the active database (see `app.core.search`)
         - `is_active`: Filter by active status (default: True, only shows active books)
+        - `If-None-Match`: ETag of a previously fetched page (optional)
 
     - **Returns**:
-        - `List[BookModel]`: List of book records matching the criteria
+        - `Response`: JSON list of books in the `BookSchema` format (or a
+          `PaginatedResponse` of them with `envelope=true`), or an
+          empty 304 response if the page is unchanged. The page is still
+          queried and encoded (its ETag is a hash of the encoded page); only
+          sending it is skipped.
+
+    - **Raises**:
+        - `HTTPException 400`: If the sort field or a requested field is not
+          allowed, or the cursor is invalid
+    """
+    order_by = sort.order_by or (RELEVANCE if filters.search else "id")
+    
+    if after and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`skip` cannot be combined with `after`"
+        )
+    
+    output_fields = _parse_fields(fields)
+    
+    async def load_page() -> BooksPage:
+        async with deps.read_session(request) as db:
+            return await _load_books_page(
+                db, order_by, sort.order_desc, skip, limit, after, output_fields, envelope, count, filters
+            )
+    
+    # Identical requests in flight share one query. The key is the parsed
+    # request, so parameter order and spelled-out defaults do not matter;
+    # clients pinned to the primary never share a replica's page.
+    page = await book_read_flights[LIST_BOOKS].run(
+        (
+            order_by,
+            order_by != RELEVANCE and sort.order_desc,
+            skip,
+            limit,
+            after,
+            tuple(output_fields),
+            envelope,
+            count,
+            filters.curation_status,
+            filters.search,
+            filters.is_active,
+            is_sticky(request.cookies),
+        ),
+        load_page
+    )
+    
+    headers = {}
+    if page.next_cursor is not None:
+        headers["X-Next-Cursor"] = page.next_cursor
+    
+    # The page's ETag covers the request and the encoded page itself, so any
+    # change to, removal from or addition to the page changes it.
+    headers["ETag"] = collection_etag([
+        sorted(request.query_params.multi_items()),
+        page.has_more,
+        page.content,
+    ])
+    headers["Cache-Control"] = "no-cache"
+    
+    if if_none_match is not None and etag_matches_none_match(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=page.content, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+async def _load_books_page(
+    db: AsyncSession,
+    order_by: str,
+    order_desc: bool,
+    skip: int,
+    limit: int,
+    after: Optional[str],
+    output_fields: List[str],
+    envelope: bool,
+    count: CountStrategy,
+    filters: deps.BookFilterParams
+) -> BooksPage:
     """
-    query = db.query(BookModel)
+    Query and encode one page of books for `get_books`.
+
+    - **Raises**:
+        - `HTTPException 400`: If the sort field is not allowed or the cursor is invalid
+    """
+    # Build the index-backed search clause for this database, if searching
+    search_clause = _search_clause(db, filters)
+    
+    # Resolve the sort key; relevance always lists the best matches first
+    if order_by == RELEVANCE:
+        if search_clause is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Ordering by relevance requires a search term"
+            )
+        sort_key = search_clause.rank
+        descending = True
+    else:
+        sort_key = SORTABLE_COLUMNS.get(order_by)
+        if sort_key is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Cannot order by '{order_by}'. "
+                    f"Allowed fields: {', '.join([*SORTABLE_COLUMNS, RELEVANCE])}"
+                )
+            )
+        descending = order_desc
+    
+    # Select plain columns rather than ORM entities; rows are encoded to JSON
+    # directly, skipping ORM hydration and per-row Pydantic validation.
+    # Only the requested fields are selected, plus what the cursor needs.
+    cursor_fields = ["id"] if order_by == RELEVANCE else ["id", sort_key.key]
+    selected_fields = [*output_fields, *(name for name in cursor_fields if name not in output_fields)]
+    
+    query = _apply_filters(
+        select(*[getattr(BookModel, name) for name in selected_fields]),
+        filters,
+        search_clause
+    )
+    
+    if order_by == RELEVANCE:
+        query = query.add_columns(sort_key.label("search_rank"))
     
+    # Seek past the last row of the previous page
+    if after:
+        query = query.where(_keyset_condition(after, order_by, descending, sort_key))
+    
+    # Order by the sort key with `id` as a tiebreaker so the order is total
+    if sort_key is BookModel.id:
+        order = [sort_key]
+    else:
+        order = [sort_key, BookModel.id]
+    query = query.order_by(*[key.desc() if descending else key.asc() for key in order])
+    
+    # Fetch one extra row to find out whether another page exists
+    result = await db.execute(query.offset(skip).limit(limit + 1))
+    rows = result.all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_more:
+        last_row = rows[-1]._mapping
+        next_cursor = encode_cursor({
+            "order_by": order_by,
+            "order_desc": descending,
+            "key": last_row["search_rank" if order_by == RELEVANCE else sort_key.key],
+            "id": last_row["id"],
+        })
+    
+    items = [dict(zip(output_fields, row)) for row in rows]
+    
+    if envelope:
+        total, count_strategy = await count_rows(
+            db,
+            _apply_filters(select(BookModel.id), filters, search_clause),
+            count,
+            cache_key=("books", filters.curation_status, filters.search, filters.is_active)
+        )
+        content = encode_json({
+            "items": items,
+            "total": total,
+            "page": None if after else skip // limit + 1,
+            "size": limit,
+            "pages": PaginatedResponse.page_count(total, limit),
+            "count_strategy": count_strategy.value,
+            "next_cursor": next_cursor,
+        })
+    else:
+        content = encode_json(items)
+    
+    return BooksPage(content=content, has_more=has_more, next_cursor=next_cursor)
+
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Resolve a `fields=` parameter into `BookSchema` field names in schema order.
+
+    - **Raises**:
+        - `HTTPException 400`: If an unknown field is requested
+    """
+    if not fields:
+        return list(BOOK_FIELDS)
+    
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(BOOK_FIELDS)
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Unknown fields: {', '.join(sorted(unknown)) or '(none given)'}. "
+                f"Available fields: {', '.join(BOOK_FIELDS)}"
+            )
+        )
+    
+    return [name for name in BOOK_FIELDS if name in requested]
+
+
+def _search_clause(db: AsyncSession, filters: deps.BookFilterParams) -> Optional[SearchClause]:
+    """
+    Build the search clause for the session's database, or None when not searching.
+    """
+    if not filters.search:
+        return None
+    return build_search(filters.search, db.get_bind().dialect.name)
+
+
+def _apply_filters(query, filters: deps.BookFilterParams, search_clause: Optional[SearchClause]):
+    """
+    Restrict a books SELECT to the rows matching the shared filter parameters.
+    """
     # Filter by active status (default: only active books)
-    query = query.filter(BookModel.is_active.is_(is_active))
+    query = query.where(BookModel.is_active.is_(filters.is_active))
     
     # Filter by curation status if provided
-    if curation_status:
-        query = query.filter(BookModel.curation_status == curation_status)
+    if filters.curation_status:
+        query = query.where(BookModel.curation_status == filters.curation_status)
     
     # Search in title and author if search term provided
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                BookModel.title.ilike(search_term),
-                BookModel.author.ilike(search_term)
-            )
+    if search_clause is not None:
+        if search_clause.join_fts:
+            query = query.join(books_fts, books_fts.c.rowid == BookModel.id)
+        query = query.where(search_clause.condition)
+    
+    return query
+
+
+def _keyset_condition(after: str, order_by: str, descending: bool, sort_key):
+    """
+    Build the `(sort_key, id) > (last_key, last_id)` seek condition for a cursor.
+
+    Row-value comparison lets the database walk the sort index directly
+    from the cursor position instead of counting past skipped rows.
+
+    - **Raises**:
+        - `HTTPException 400`: If the cursor is malformed or was issued for a different sort order
+    """
+    try:
+        cursor = decode_cursor(after)
+        last_id = cursor["id"]
+        last_key = cursor["key"]
+    except (InvalidCursorError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
         )
     
-    # Apply pagination and return results
-    return query.offset(skip).limit(limit).all()
+    # Decoded JSON may hold any type; only values of the sort column's type
+    # may reach the driver (a list or dict would fail there with a 500)
+    key_types = (int, float) if order_by == RELEVANCE else (sort_key.type.python_type,)
+    if not (_is_cursor_value(last_id, (int,)) and _is_cursor_value(last_key, key_types)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    
+    if cursor.get("order_by") != order_by or cursor.get("order_desc") != descending:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pagination cursor does not match the requested sort order"
+        )
+    
+    if sort_key is BookModel.id:
+        position, bound = BookModel.id, last_id
+    else:
+        position = tuple_(sort_key, BookModel.id)
+        bound = tuple_(last_key, last_id)
+    
+    return position < bound if descending else position > bound
+
+
+def _is_cursor_value(value: Any, types: Tuple[type, ...]) -> bool:
+    # bool is an int subclass but never a valid sort position
+    return isinstance(value, types) and not isinstance(value, bool)
+
+
+# READ - Stream all matching books as a file
+@router.get(
+    "/export",
+    summary="Export books",
+    description=(
+        "Stream every book matching the filters as NDJSON (one JSON object per line) "
+        "or CSV. Rows are read from a server-side cursor, so exports of any size "
+        "use constant memory."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "The matching books, ordered by id",
+        }
+    },
+    tags=["Books"]
+)
+async def export_books(
+    *,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="Output format"),
+    filters: deps.BookFilterParams = Depends()
+) -> StreamingResponse:
+    """
+    Stream books matching the filters in NDJSON or CSV format.
+
+    The generator opens its own database session because it keeps reading
+    after this handler has returned; rows are fetched `EXPORT_BATCH_SIZE`
+    at a time and written out as soon as each batch arrives.
+
+    - **Args**:
+        - `format`: `ndjson` (default) or `csv`
+        - `curation_status`, `search`, `is_active`: Same filters as `GET /books`
+
+    - **Returns**:
+        - `StreamingResponse`: The exported rows, ordered by id
+    """
+    encode_batch = _encode_ndjson_batch if export_format == "ndjson" else _encode_csv_batch
+    
+    async def stream_rows():
+        if export_format == "csv":
+            yield _encode_csv_batch([BOOK_FIELDS])
+        
+        async with async_session_scope() as db:
+            query = _apply_filters(
+                select(*[getattr(BookModel, name) for name in BOOK_FIELDS]),
+                filters,
+                _search_clause(db, filters)
+            ).order_by(BookModel.id)
+            
+            result = await db.stream(query.execution_options(yield_per=settings.export_batch_size))
+            async for batch in result.partitions(settings.export_batch_size):
+                yield encode_batch(batch)
+    
+    return StreamingResponse(
+        stream_rows(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="books.{export_format}"'}
+    )
+
+
+def _encode_ndjson_batch(rows) -> bytes:
+    """
+    Encode rows as newline-delimited JSON objects.
+    """
+    return b"".join(
+        encode_json(dict(zip(BOOK_FIELDS, row))) + b"\n"
+        for row in rows
+    )
+
+
+def _encode_csv_batch(rows) -> str:
+    """
+    Encode rows as CSV lines.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        for row in rows
+    )
+    return buffer.getvalue()
 
 
 # READ - Get a specific book by ID
@@ -115,38 +733,137 @@ def get_books(
     "/{book_id}",
     response_model=BookSchema,
     summary="Get a book by ID",
-    description="Retrieve a specific book by its unique identifier.",
+    description=(
+        "Retrieve a specific book by its unique identifier. Responses carry "
+        "`ETag` and `Last-Modified`; send them back as `If-None-Match` or "
+        "`If-Modified-Since` to get `304 Not Modified` when nothing changed."
+    ),
+    responses={304: {"description": "The book has not changed"}},
     tags=["Books"]
 )
-def get_book(
+async def get_book(
     *,
-    db: Session = Depends(deps.get_db),
-    book_id: int
-) -> BookModel:
+    request: Request,
+    book_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)"),
+    if_none_match: Optional[str] = Header(None, description="ETag(s) of the copy the client holds"),
+    if_modified_since: Optional[str] = Header(None, description="Date of the copy the client holds")
+) -> Response:
     """
     Retrieve a specific book by its ID.
 
+    Serialized books are kept in the in-process `book_cache`, so repeated
+    reads of the same book are answered without a database query (the
+    session is only opened on a miss, so no pooled connection is checked out).
+    Misses read from a replica when one is configured, except for clients
+    that wrote recently (see `deps.read_session`); concurrent misses of the
+    same book share one query (see `app.core.coalescing`).
+
     - **Args**:
         - `book_id`: The unique identifier of the book
+        - `fields`: Comma-separated `BookSchema` fields to return, e.g. `id,title`.
+          The full book is still loaded on a cache miss so it can be cached.
+        - `If-None-Match` / `If-Modified-Since`: Validators from an earlier response
 
     - **Returns**:
-        - `BookModel`: The book record if found
+        - `Response`: The book record serialized as `BookSchema`, or an empty
+          304 response if the client's copy is current
 
     - **Raises**:
+        - `HTTPException 400`: If an unknown field is requested
         - `HTTPException 404`: If the book is not found
     """
-    book = db.query(BookModel).filter(
-        BookModel.id == book_id,
-        BookModel.is_active.is_(True)
-    ).first()
+    output_fields = _parse_fields(fields) if fields else None
     
-    if not book:
+    cached = book_cache.get(book_id)
+    if cached is not None:
+        return _conditional_response(cached, output_fields, if_none_match, if_modified_since)
+    
+    # Concurrent misses of the same book share one load
+    cached = await book_read_flights[GET_BOOK].run(
+        (book_id, is_sticky(request.cookies)),
+        lambda: _load_book(request, book_id)
+    )
+    
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Book with id {book_id} not found"
         )
     
-    return book
+    return _conditional_response(cached, output_fields, if_none_match, if_modified_since)
+
+
+async def _load_book(request: Request, book_id: int) -> Optional[CachedBook]:
+    """
+    Load an active book for `get_book` and store it in `book_cache`.
+
+    Returns None when the book does not exist or was deleted.
+    """
+    cache_token = book_cache.token()
+    async with deps.read_session(request) as db:
+        book = await db.scalar(
+            select(BookModel).where(
+                BookModel.id == book_id,
+                BookModel.is_active.is_(True)
+            )
+        )
+        from_replica = is_replica_session(db)
+    
+    if not book:
+        return None
+    
+    data = BookSchema.model_validate(book).model_dump()
+    cached = CachedBook(
+        data=data,
+        payload=encode_json(data),
+        etag=entity_etag(book.id, book.version),
+        last_modified=book.updated_at,
+        version=book.version
+    )
+    # A lagging replica may still return the version a recent write replaced
+    if not (from_replica and book_cache.invalidated_within(settings.replica_max_lag_seconds)):
+        book_cache.set(book_id, cached, token=cache_token)
+    
+    return cached
+
+
+def _conditional_response(
+    cached: "CachedBook",
+    output_fields: Optional[List[str]],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str]
+) -> Response:
+    """
+    Answer a single-book read with 200 or 304 based on the client's validators.
+
+    Sparse representations (`output_fields`) get their own ETag variant.
+    If-Modified-Since is only consulted when If-None-Match is absent (RFC 9110).
+    """
+    etag = cached.etag
+    if output_fields is not None:
+        etag = entity_etag(cached.data["id"], cached.version, variant=".".join(output_fields))
+    
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(cached.last_modified),
+        "Cache-Control": "no-cache",  # Clients may store it but must revalidate
+    }
+    
+    if if_none_match is not None:
+        not_modified = etag_matches_none_match(if_none_match, etag)
+    else:
+        not_modified = bool(if_modified_since) and not_modified_since(if_modified_since, cached.last_modified)
+    
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if output_fields is None:
+        content = cached.payload
+    else:
+        content = encode_json({name: cached.data[name] for name in output_fields})
+    
+    return Response(content=content, media_type=JSON_MEDIA_TYPE, headers=headers)
 
 
 # UPDATE - Update an existing book
@@ -154,51 +871,127 @@ def get_book(
     "/{book_id}",
     response_model=BookSchema,
     summary="Update a book",
-    description="Update an existing book's information.",
+    description=(
+        "Update an existing book's information. Send the book's `ETag` as "
+        "`If-Match` to only apply the update if nobody changed it meanwhile."
+    ),
+    responses={412: {"description": "The book changed since the given ETag"}},
     tags=["Books"]
 )
-def update_book(
+async def update_book(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     book_id: int,
-    book_update: BookUpdate
-) -> BookModel:
+    book_update: BookUpdate,
+    if_match: Optional[str] = Header(None, description="Only update if the book's current ETag matches")
+) -> Response:
     """
     Update an existing book record.
 
+    The update, the existence check and the If-Match precondition are one
+    `UPDATE ... RETURNING` statement, so a write costs a single round trip
+    plus the commit.
+
     - **Args**:
         - `book_id`: The unique identifier of the book to update
         - `book_update`: The updated book data (partial updates supported)
+        - `If-Match`: ETag the client last saw (optional)
 
     - **Returns**:
-        - `BookModel`: The updated book record
+        - `Response`: The updated book serialized as `BookSchema`, with its new `ETag`
 
     - **Raises**:
         - `HTTPException 404`: If the book is not found
+        - `HTTPException 412`: If `If-Match` does not match the current ETag
+    """
+    return await _update_book(db, book_id, book_update, if_match)
+
+
+# UPDATE - Partially update an existing book
+@router.patch(
+    "/{book_id}",
+    response_model=BookSchema,
+    summary="Partially update a book",
+    description=(
+        "Change only the fields present in the request body. Send the book's "
+        "`ETag` as `If-Match` to only apply the change if nobody changed it meanwhile."
+    ),
+    responses={412: {"description": "The book changed since the given ETag"}},
+    tags=["Books"]
+)
+async def patch_book(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    book_id: int,
+    book_update: BookUpdate,
+    if_match: Optional[str] = Header(None, description="Only update if the book's current ETag matches")
+) -> Response:
+    """
+    Partially update an existing book record.
+
+    Fields omitted from the body keep their current values. Like `PUT`,
+    this is a single `UPDATE ... RETURNING` statement.
+
+    - **Args**:
+        - `book_id`: The unique identifier of the book to update
+        - `book_update`: The fields to change
+        - `If-Match`: ETag the client last saw (optional)
+
+    - **Returns**:
+        - `Response`: The updated book serialized as `BookSchema`, with its new `ETag`
+
+    - **Raises**:
+        - `HTTPException 404`: If the book is not found
+        - `HTTPException 412`: If `If-Match` does not match the current ETag
+    """
+    return await _update_book(db, book_id, book_update, if_match)
+
+
+async def _update_book(
+    db: AsyncSession,
+    book_id: int,
+    book_update: BookUpdate,
+    if_match: Optional[str]
+) -> Response:
+    """
+    Apply a partial update in one statement and answer with the new representation.
     """
-    # Find the existing book
-    db_book = db.query(BookModel).filter(
-        BookModel.id == book_id,
-        BookModel.is_active.is_(True)
-    ).first()
-    
-    if not db_book:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Book with id {book_id} not found"
-        )
-    
     # Update only the fields that were provided (partial update)
     update_data = book_update.model_dump(exclude_unset=True)
+    columns = [getattr(BookModel, name) for name in BOOK_FIELDS] + [BookModel.updated_at, BookModel.version]
+    conditions = _write_conditions(book_id, if_match)
+    
+    if update_data:
+        statement = (
+            update(BookModel)
+            .where(*conditions)
+            .values(**update_data, version=BookModel.version + 1)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        # Nothing to change: read the book under the same conditions
+        statement = select(*columns).where(*conditions)
     
-    for field, value in update_data.items():
-        setattr(db_book, field, value)
+    row = (await db.execute(statement)).first()
+    if row is None:
+        await db.rollback()
+        await _raise_write_miss(db, book_id, if_match)
     
-    # Commit the changes
-    db.commit()
-    db.refresh(db_book)
+    if update_data:
+        await db.commit()
+        book_cache.invalidate(book_id)
+        _forget_inflight_reads()
     
-    return db_book
+    *values, updated_at, version = row
+    return Response(
+        content=encode_json(dict(zip(BOOK_FIELDS, values))),
+        media_type=JSON_MEDIA_TYPE,
+        headers={
+            "ETag": entity_etag(book_id, version),
+            "Last-Modified": http_date(updated_at),
+        }
+    )
 
 
 # DELETE - Soft delete a book (set is_active to False)
@@ -207,43 +1000,245 @@ def update_book(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete a book",
     description="Soft delete a book (marks as inactive rather than permanently deleting).",
+    responses={412: {"description": "The book changed since the given ETag"}},
     tags=["Books"]
 )
-def delete_book(
+async def delete_book(
     *,
-    db: Session = Depends(deps.get_db),
-    book_id: int
+    db: AsyncSession = Depends(deps.get_async_db),
+    book_id: int,
+    if_match: Optional[str] = Header(None, description="Only delete if the book's current ETag matches")
 ) -> None:
     """
     Soft delete a book by setting is_active to False.
 
+    Runs as a single `UPDATE ... RETURNING` statement.
+
     - **Args**:
         - `book_id`: The unique identifier of the book to delete
+        - `If-Match`: ETag the client last saw (optional)
 
     - **Returns**:
         - `None`: No content (204 status)
 
     - **Raises**:
         - `HTTPException 404`: If the book is not found
+        - `HTTPException 412`: If `If-Match` does not match the current ETag
     """
-    # Find the existing book
-    db_book = db.query(BookModel).filter(
-        and_(
-            BookModel.id == book_id,
-            BookModel.is_active.is_(True)
-        )
-    ).first()
-    
-    if not db_book:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Book with id {book_id} not found"
-        )
-    
     # Soft delete by setting is_active to False
-    db_book.is_active = False
+    deleted = await db.scalar(
+        update(BookModel)
+        .where(*_write_conditions(book_id, if_match))
+        .values(is_active=False, version=BookModel.version + 1)
+        .returning(BookModel.id)
+        .execution_options(synchronize_session=False)
+    )
+    
+    if deleted is None:
+        await db.rollback()
+        await _raise_write_miss(db, book_id, if_match)
     
     # Commit the changes
-    db.commit()
+    await db.commit()
+    book_cache.invalidate(book_id)
+    _forget_inflight_reads()
     
     return None
+
+
+def _write_conditions(book_id: int, if_match: Optional[str]) -> List[Any]:
+    """
+    WHERE conditions selecting the active book, including its If-Match precondition.
+
+    ETags are decoded back into row versions, so the precondition is
+    checked by the same statement that performs (and bumps the version of)
+    the write.
+    """
+    conditions = [BookModel.id == book_id, BookModel.is_active.is_(True)]
+    if if_match is None or "*" in (tag.strip() for tag in if_match.split(",")):
+        return conditions
+    
+    versions = []
+    for tag in if_match.split(","):
+        parsed = parse_entity_etag(tag)
+        if parsed is not None and parsed[0] == book_id:
+            versions.append(parsed[1])
+    
+    conditions.append(BookModel.version.in_(versions) if versions else false())
+    return conditions
+
+
+async def _raise_write_miss(db: AsyncSession, book_id: int, if_match: Optional[str]) -> None:
+    """
+    Explain why a conditional write matched no row.
+
+    - **Raises**:
+        - `HTTPException 412`: If the book exists but `if_match` did not hold
+        - `HTTPException 404`: Otherwise
+    """
+    if if_match is not None:
+        exists = await db.scalar(
+            select(BookModel.id).where(BookModel.id == book_id, BookModel.is_active.is_(True))
+        )
+        if exists is not None:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=f"Book with id {book_id} has been modified"
+            )
+    
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Book with id {book_id} not found"
+    )
+
+
+# UPDATE - Change the curation status of many books at once
+@router.post(
+    "/bulk/status",
+    response_model=BookBulkChangeResult,
+    summary="Change the curation status of many books",
+    description=(
+        "Set `curation_status` on the books listed in `ids`, or on every book "
+        "matching the list filters (`curation_status`, `search`, `is_active`) "
+        "when `ids` is omitted. Applied with set-based UPDATE statements in "
+        "chunks of `BULK_UPDATE_CHUNK_SIZE`."
+    ),
+    tags=["Books"]
+)
+async def update_books_status_bulk(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    change: BookBulkStatusUpdate,
+    filters: deps.BookFilterParams = Depends()
+) -> BookBulkChangeResult:
+    """
+    Move many books to a new curation status.
+
+    Books that already have the target status are left untouched and not
+    counted. Each chunk is its own transaction, so a failure part-way keeps
+    the chunks already committed.
+
+    - **Args**:
+        - `change`: Target status, optional `ids` and `return_ids`
+        - `curation_status` / `search` / `is_active`: Selection filters,
+          combined with `ids` when both are given
+
+    - **Returns**:
+        - `BookBulkChangeResult`: Number of changed books and, if requested, their ids
+
+    - **Raises**:
+        - `HTTPException 400`: If neither `ids` nor a `curation_status`/`search` filter is given
+        - `HTTPException 413`: If more than `BULK_MAX_ITEMS` ids are sent
+    """
+    selection = _bulk_selection(db, change, filters).where(
+        BookModel.curation_status != change.curation_status
+    )
+    return await _apply_bulk_change(db, change, selection, {"curation_status": change.curation_status})
+
+
+# DELETE - Soft delete many books at once
+@router.post(
+    "/bulk/delete",
+    response_model=BookBulkChangeResult,
+    summary="Delete many books",
+    description=(
+        "Soft delete the books listed in `ids`, or every book matching the "
+        "list filters (`curation_status`, `search`) when `ids` is omitted. "
+        "Applied with set-based UPDATE statements in chunks of `BULK_UPDATE_CHUNK_SIZE`."
+    ),
+    tags=["Books"]
+)
+async def delete_books_bulk(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    selection_in: BookBulkSelection,
+    filters: deps.BookFilterParams = Depends()
+) -> BookBulkChangeResult:
+    """
+    Soft delete many books by setting is_active to False.
+
+    Only active books are affected, whatever `is_active` says.
+
+    - **Args**:
+        - `selection_in`: Optional `ids` and `return_ids`
+        - `curation_status` / `search`: Selection filters, combined with
+          `ids` when both are given
+
+    - **Returns**:
+        - `BookBulkChangeResult`: Number of deleted books and, if requested, their ids
+
+    - **Raises**:
+        - `HTTPException 400`: If neither `ids` nor a `curation_status`/`search` filter is given
+        - `HTTPException 413`: If more than `BULK_MAX_ITEMS` ids are sent
+    """
+    filters.is_active = True
+    selection = _bulk_selection(db, selection_in, filters)
+    return await _apply_bulk_change(db, selection_in, selection, {"is_active": False})
+
+
+def _bulk_selection(db: AsyncSession, selection_in: BookBulkSelection, filters: deps.BookFilterParams):
+    """
+    Build the SELECT of book ids targeted by a bulk change.
+
+    - **Raises**:
+        - `HTTPException 400`: If the request would select every book
+        - `HTTPException 413`: If more than `BULK_MAX_ITEMS` ids are sent
+    """
+    if selection_in.ids is None and not (filters.curation_status or filters.search):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide ids or at least one of the curation_status/search filters"
+        )
+    if selection_in.ids is not None and len(selection_in.ids) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_max_items} ids can be changed per request"
+        )
+    
+    selection = _apply_filters(select(BookModel.id), filters, _search_clause(db, filters))
+    if selection_in.ids is not None:
+        selection = selection.where(BookModel.id.in_(selection_in.ids))
+    return selection
+
+
+async def _apply_bulk_change(
+    db: AsyncSession,
+    selection_in: BookBulkSelection,
+    selection,
+    values: Dict[str, Any]
+) -> BookBulkChangeResult:
+    """
+    Run a chunked bulk change and invalidate the cached copies of changed books.
+    """
+    outcome = await update_books_chunked(
+        db,
+        selection,
+        values,
+        chunk_size=settings.bulk_update_chunk_size,
+        max_ids=settings.bulk_max_items if selection_in.return_ids else 0,
+        on_chunk=_invalidate_books
+    )
+    return BookBulkChangeResult(
+        affected=outcome.affected,
+        chunks=outcome.chunks,
+        ids=outcome.ids if selection_in.return_ids else None,
+        truncated=outcome.truncated if selection_in.return_ids else False
+    )
+
+
+def _invalidate_books(book_ids: List[int]) -> None:
+    """
+    Drop changed books from `book_cache`.
+    """
+    for book_id in book_ids:
+        book_cache.invalidate(book_id)
+    _forget_inflight_reads()
+
+
+def _forget_inflight_reads() -> None:
+    """
+    Make reads arriving after a write load afresh instead of sharing a
+    load that started before it (see `app.core.coalescing`).
+    """
+    for flight in book_read_flights.values():
+        flight.forget()
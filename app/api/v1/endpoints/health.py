@@ -3,17 +3,24 @@ Health check endpoints for API monitoring
 
 This module provides comprehensive health check endpoints that verify
 the status of the API service, database connectivity, and system information.
+Database status is served from the background health prober, so polling
+these endpoints does not use database connections.
 """
 
 from datetime import datetime
 from typing import Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi import APIRouter, HTTPException, Query, status
 
-from app.api.deps import get_db, check_database_connection
+from app.core.cache import book_cache
+from app.core.coalescing import book_read_flights
 from app.core.config import settings
+from app.core.counting import count_cache
+from app.core.database import active_engine
+from app.core.health import health_prober
+from app.core.idempotency import idempotency_store
+from app.core.pool import pool_status
+from app.core.replicas import replica_set
 from app.schemas.base import MessageResponse
 
 router = APIRouter()
@@ -21,13 +28,14 @@ router = APIRouter()
 
 @router.get("/", response_model=Dict[str, Any])
 async def health_check(
-    db: Session = Depends(get_db)
+    deep: bool = Query(False, description="Probe the database now instead of serving the cached probe result")
 ) -> Dict[str, Any]:
     """
     Comprehensive health check endpoint
     
-    Verifies the API service status, database connectivity, and provides
-    system information. This is the main health check endpoint for monitoring.
+    Reports the API service status and the database status from the
+    background health prober, without touching the database. Pass
+    `deep=true` to run a live probe instead.
     
     Returns:
         Dict containing:
@@ -35,27 +43,28 @@ async def health_check(
         - service: Service name
         - environment: Current environment
         - database: Database connection status
+        - database_latency_ms: Duration of the probe
+        - checked_at: When the database was probed
+        - staleness_seconds: Age of the probe result
         - timestamp: Current timestamp
         - version: API version
     """
+    probe = await (health_prober.probe() if deep else health_prober.current())
     
     # Check database connection
-    database_status = "connected"
-    try:
-        # Test database with a simple query
-        db.execute(text("SELECT 1"))
-        db.commit()
-    except Exception as e:
-        database_status = f"disconnected: {str(e)}"
+    database_status = "connected" if probe.connected else f"disconnected: {probe.error}"
     
     # Determine overall status
-    overall_status = "healthy" if database_status == "connected" else "unhealthy"
+    overall_status = "healthy" if probe.connected else "unhealthy"
     
     return {
         "status": overall_status,
         "service": settings.project_name,
         "environment": settings.environment,
         "database": database_status,
+        "database_latency_ms": probe.latency_ms,
+        "checked_at": probe.checked_at.isoformat() + "Z",
+        "staleness_seconds": probe.staleness_seconds(),
         "timestamp": datetime.utcnow().isoformat() + "Z",
         "version": "1.0.0",
         "api_docs": "/docs"
@@ -82,45 +91,63 @@ async def simple_health_check() -> Dict[str, Any]:
 
 @router.get("/database", response_model=Dict[str, Any])
 async def database_health_check(
-    is_connected: bool = Depends(check_database_connection),
-    db: Session = Depends(get_db)
+    deep: bool = Query(False, description="Probe the database now instead of serving the cached probe result")
 ) -> Dict[str, Any]:
     """
     Database-specific health check endpoint
     
-    Provides detailed information about database connectivity and status.
+    Provides detailed information about database connectivity and status,
+    including live connection pool usage and checkout wait statistics.
+    Connectivity comes from the background health prober (see `staleness_seconds`)
+    unless `deep=true` asks for a live probe.
     
     Args:
-        is_connected: Database connection status from dependency
-        db: Database session
+        deep: Run a live probe instead of serving the cached result
         
     Returns:
         Dict containing detailed database status information
+        
+    Raises:
+        HTTPException: 503 if the database is unreachable
     """
+    probe = await (health_prober.probe() if deep else health_prober.current())
     
-    try:
-        # Get some database statistics
-        result = db.execute(text("SELECT version()")).fetchone()
-        db_version = result[0] if result else "Unknown"
-        
-        # Test a simple transaction
-        db.execute(text("SELECT COUNT(*) FROM information_schema.tables"))
-        
-        return {
-            "database": "connected",
-            "status": "healthy",
-            "version": db_version,
-            "connection_pool": "active",
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
-        
-    except Exception as e:
+    if not probe.connected:
         raise HTTPException(
-            status_code=503,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail={
-                "database": "disconnected",
+                **probe.to_dict(),
                 "status": "unhealthy",
-                "error": str(e),
                 "timestamp": datetime.utcnow().isoformat() + "Z"
             }
-        ) 
\ No newline at end of file
+        )
+    
+    return {
+        **probe.to_dict(),
+        "status": "healthy",
+        "connection_pool": pool_status(active_engine().pool),
+        "read_replicas": replica_set.stats() if replica_set.enabled else None,
+        "timestamp": datetime.utcnow().isoformat() + "Z"
+    }
+
+
+@router.get("/cache", response_model=Dict[str, Any])
+async def cache_stats() -> Dict[str, Any]:
+    """
+    In-process cache statistics endpoint
+    
+    Reports hit, miss, eviction and sizing counters for this worker's
+    caches, and how many book reads shared an identical in-flight load
+    (`single_flight`, per route). Counters are per process and reset on
+    restart.
+    
+    Returns:
+        Dict containing statistics for each cache
+    """
+    return {
+        "book_cache": book_cache.stats(),
+        "count_cache": count_cache.stats(),
+        "idempotency_store": idempotency_store.stats(),
+        "single_flight": {name: flight.stats() for name, flight in book_read_flights.items()},
+        "timestamp": datetime.utcnow().isoformat() + "Z"
+    }
@@ -0,0 +1,2 @@
+# Command-line tools package
+# Each module is runnable with `python -m app.cli.<name>`
@@ -0,0 +1,90 @@
+"""
+Import books from an NDJSON or CSV file
+
+Usage:
+    python -m app.cli.import_books catalog.ndjson
+    python -m app.cli.import_books catalog.csv --batch-size 10000
+
+The file is read in fixed-size chunks and written in bounded batches
+(COPY on PostgreSQL), so memory use does not depend on the file size.
+Prints the import summary as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import AsyncIterator
+
+from app.core.config import settings
+from app.core.database import async_session_scope, dispose_engines
+from app.services.book_import import IMPORT_FORMATS, import_books, parse_csv, parse_ndjson
+
+# Bytes read from the file per chunk
+READ_CHUNK_SIZE = 64 * 1024
+
+
+async def read_chunks(path: Path) -> AsyncIterator[bytes]:
+    """
+    Yield the file content in fixed-size chunks
+    """
+    with path.open("rb") as file:
+        while chunk := file.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def run(path: Path, file_format: str, batch_size: int) -> dict:
+    """
+    Import a file and return the summary as a dictionary
+
+    The database engines are disposed before returning, so pooled
+    connections are closed on this event loop rather than at exit.
+    """
+    parse = parse_csv if file_format == "csv" else parse_ndjson
+
+    try:
+        async with async_session_scope() as db:
+            summary = await import_books(
+                db,
+                parse(read_chunks(path), max_record_bytes=settings.import_max_record_bytes),
+                batch_size=batch_size,
+                max_reported=settings.import_max_reported_rejections,
+            )
+    finally:
+        await dispose_engines()
+
+    return {
+        "accepted": summary.accepted,
+        "rejected": summary.rejected,
+        "rejected_rows": [{"line": line, "error": error} for line, error in summary.rejected_rows],
+        "truncated": summary.truncated,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import books from an NDJSON or CSV file")
+    parser.add_argument("path", type=Path, help="File to import")
+    parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        help="File format (default: from the file extension, falling back to NDJSON)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.import_batch_size,
+        help="Rows written per batch",
+    )
+    args = parser.parse_args()
+
+    file_format = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    result = asyncio.run(run(args.path, file_format, args.batch_size))
+
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if result["rejected"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Run the API in production: several worker processes behind one socket
+
+Usage:
+    python -m app.cli.serve
+    python -m app.cli.serve --workers 4 --port 8000
+    kill -HUP <parent pid>     # Rolling restart, e.g. after a deploy
+
+The parent binds the socket once and supervises `--workers` uvicorn
+workers (default: `settings.worker_count`, one per CPU core). Each worker
+builds the app with `app.main:create_app` and opens its own database
+engines on first use; engines inherited through a fork are given fresh
+pools (see `app.core.database`), so pooled connections are never shared
+between processes.
+
+Database connections: with `DB_MAX_CONNECTIONS` set, every worker caps its
+pool at DB_MAX_CONNECTIONS // workers, so all workers together stay within
+the database's `max_connections`.
+
+Signals sent to the parent:
+- SIGHUP: rolling restart. Each worker is replaced in turn: the new one
+  must be ready before the old one stops accepting connections and gets
+  `--graceful-timeout` seconds to finish its in-flight requests.
+- SIGTERM / SIGINT: graceful shutdown with the same drain period.
+- SIGTTIN / SIGTTOU: add or remove a worker.
+Workers that die are replaced.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+from app.core.database import pool_options
+
+# Uvicorn's own logger, configured by uvicorn.Config
+logger = logging.getLogger("uvicorn.error")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to bind")
+    parser.add_argument("--port", type=int, default=settings.port, help="Port to bind")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.worker_count,
+        help="Worker processes (default: WORKERS, or one per CPU core)",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=settings.graceful_timeout_seconds,
+        help="Seconds in-flight requests get to finish on restart or shutdown",
+    )
+    parser.add_argument("--log-level", default="info", help="Uvicorn log level")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    # Workers read their settings from the environment; pass on the worker
+    # count so each sizes its pool from its share of DB_MAX_CONNECTIONS
+    os.environ["WORKERS"] = str(args.workers)
+    settings.workers = args.workers
+
+    config = uvicorn.Config(
+        "app.main:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level=args.log_level,
+        proxy_headers=True,
+    )
+    options = pool_options()
+    logger.info(
+        "Starting %d workers; database pool per worker: pool_size=%d, max_overflow=%d",
+        args.workers,
+        options["pool_size"],
+        options["max_overflow"],
+    )
+
+    # Supervise even a single worker, so SIGHUP restarts work the same way
+    sock = config.bind_socket()
+    Multiprocess(config, sockets=[sock]).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
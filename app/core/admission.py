@@ -0,0 +1,293 @@
+"""
+Adaptive admission control for Reactive Hub API
+
+Without a limit, every request that arrives is started at once; when the
+database falls behind they all queue for the same few pooled connections
+and every request gets slow. This module caps the requests in flight per
+route class and sheds the excess early instead:
+
+- Classes: `reads` (GET/HEAD), `writes` (everything else but OPTIONS) and
+  `health` (health checks and /metrics). CORS preflights (OPTIONS) are
+  never limited. Health has its own fixed limit
+  and no queue, so load balancer probes keep being answered while reads
+  and writes are saturated.
+- A request over its class's limit waits in a bounded FIFO queue for at
+  most `settings.admission_queue_timeout_seconds`. A full queue or an
+  expired wait sheds the request with `settings.admission_shed_status`
+  (503 or 429) and `Retry-After`.
+- The read and write limits adapt with AIMD: while saturated and fast,
+  the limit grows by about one per `limit` completions; when time to
+  first byte exceeds `settings.admission_target_latency_ms`, or the app
+  answers 503 (e.g. pool exhaustion), it shrinks by `DECREASE_FACTOR`,
+  at most once per observed latency.
+
+Latency is measured from admission to the start of the response, so
+long streaming responses (exports) do not count as slow. Limits are per
+worker process.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional
+
+from starlette.responses import JSONResponse
+
+from app.core.config import Settings, settings
+
+READS = "reads"
+WRITES = "writes"
+HEALTH = "health"
+
+SAFE_METHODS = {"GET", "HEAD"}
+
+# Methods passed through without admission (CORS preflights do no work)
+UNLIMITED_METHODS = {"OPTIONS"}
+
+# Multiplicative decrease applied to a limit when latency is over target
+DECREASE_FACTOR = 0.9
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit with a bounded wait queue for one route class
+
+    Args:
+        name: Route class name, for stats
+        initial_limit: Requests allowed in flight at first
+        min_limit: Lowest the adaptive limit may go
+        max_limit: Highest the adaptive limit may go
+        target_latency_seconds: Latency above which the limit shrinks
+        queue_size: Requests that may wait for a slot; 0 sheds at once
+        queue_timeout_seconds: Longest a request waits before it is shed
+        adaptive: Adjust the limit from observed latency (AIMD)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency_seconds: float,
+        queue_size: int,
+        queue_timeout_seconds: float,
+        adaptive: bool = True,
+    ):
+        self.name = name
+        self.reconfigure(
+            initial_limit, min_limit, max_limit, target_latency_seconds, queue_size, queue_timeout_seconds, adaptive
+        )
+        self.in_flight = 0
+        self._queue: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self.admitted = 0
+        self.queued = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+
+    def reconfigure(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency_seconds: float,
+        queue_size: int,
+        queue_timeout_seconds: float,
+        adaptive: bool = True,
+    ) -> None:
+        """
+        Change the limits and restart adaptation from `initial_limit`
+        """
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency_seconds = target_latency_seconds
+        self.queue_size = queue_size
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.adaptive = adaptive
+
+    def _has_slot(self) -> bool:
+        return self.in_flight < max(int(self.limit), 1)
+
+    async def acquire(self) -> bool:
+        """
+        Wait for a slot; return False if the request must be shed
+        """
+        if self._has_slot() and not self._queue:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._queue) >= self.queue_size:
+            self.shed_queue_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queue.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            if not (waiter.done() and not waiter.cancelled()):
+                self.shed_timeout += 1
+                return False
+            # A slot was handed over as the wait timed out: use it
+        except BaseException:
+            # Cancelled while waiting: give back a slot handed over meanwhile
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._wake()
+            raise
+        self.admitted += 1
+        return True
+
+    def release(self, latency_seconds: float, overloaded: bool = False) -> None:
+        """
+        Free a slot and adapt the limit to the request's latency
+
+        Args:
+            latency_seconds: Time from admission to the response start
+            overloaded: The app itself reported overload (503)
+        """
+        saturated = self.in_flight >= int(self.limit) or bool(self._queue)
+        self.in_flight -= 1
+
+        if self.adaptive:
+            if overloaded or latency_seconds > self.target_latency_seconds:
+                now = time.monotonic()
+                # Back off once per round trip, not once per slow request
+                if now - self._last_decrease >= latency_seconds:
+                    self.limit = max(self.min_limit, self.limit * DECREASE_FACTOR)
+                    self._last_decrease = now
+            elif saturated:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self._wake()
+
+    def _wake(self) -> None:
+        # Hand free slots to waiters in arrival order
+        while self._queue and self._has_slot():
+            waiter = self._queue.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._queue.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_length": len(self._queue),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
+
+
+def _limiter_options(name: str, settings: Settings) -> Dict[str, Any]:
+    if name == HEALTH:
+        return {
+            "initial_limit": settings.admission_health_limit,
+            "min_limit": settings.admission_health_limit,
+            "max_limit": settings.admission_health_limit,
+            "target_latency_seconds": 0.0,
+            "queue_size": 0,
+            "queue_timeout_seconds": 0.0,
+            "adaptive": False,
+        }
+    return {
+        "initial_limit": settings.admission_read_limit if name == READS else settings.admission_write_limit,
+        "min_limit": settings.admission_min_limit,
+        "max_limit": settings.admission_max_limit,
+        "target_latency_seconds": settings.admission_target_latency_ms / 1000,
+        "queue_size": settings.admission_queue_size,
+        "queue_timeout_seconds": settings.admission_queue_timeout_seconds,
+    }
+
+
+# Limiters of this process by route class
+admission_limiters: Dict[str, AdmissionLimiter] = {
+    name: AdmissionLimiter(name, **_limiter_options(name, settings)) for name in (READS, WRITES, HEALTH)
+}
+
+
+def apply_settings(settings: Settings) -> None:
+    """
+    Reconfigure every limiter for new settings (see `app.main.create_app`)
+    """
+    for name, limiter in admission_limiters.items():
+        limiter.reconfigure(**_limiter_options(name, settings))
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware admitting, queueing or shedding requests per route class
+
+    Args:
+        app: The wrapped ASGI app
+        health_paths: Path prefixes of the health class
+        limiters: Limiters by route class
+        shed_status: Status code of shed responses (503 or 429)
+        retry_after_seconds: Retry-After sent with shed responses
+    """
+
+    def __init__(
+        self,
+        app,
+        health_paths: Iterable[str],
+        limiters: Dict[str, AdmissionLimiter] = admission_limiters,
+        shed_status: int = 503,
+        retry_after_seconds: int = 1,
+    ):
+        self.app = app
+        self.health_paths = tuple(path.rstrip("/") for path in health_paths)
+        self.limiters = limiters
+        self.shed_status = shed_status
+        self.retry_after_seconds = retry_after_seconds
+
+    def route_class(self, scope) -> str:
+        path = scope["path"].rstrip("/")
+        if any(path == prefix or path.startswith(prefix + "/") for prefix in self.health_paths):
+            return HEALTH
+        return READS if scope["method"] in SAFE_METHODS else WRITES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in UNLIMITED_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[self.route_class(scope)]
+        if not await limiter.acquire():
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=self.shed_status,
+                headers={"Retry-After": str(self.retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+
+        admitted_at = time.perf_counter()
+        first_byte_at: Optional[float] = None
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal first_byte_at, status_code
+            if message["type"] == "http.response.start":
+                first_byte_at = time.perf_counter()
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            latency = (first_byte_at or time.perf_counter()) - admitted_at
+            limiter.release(latency, overloaded=status_code == 503)
@@ -0,0 +1,202 @@
+"""
+In-process caching for Reactive Hub API
+
+This module provides a small bounded LRU cache with per-entry expiry,
+used to serve hot single-entity reads without touching the database.
+Caches are per process: each worker keeps its own copy, and writes made
+through this process invalidate entries precisely.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import Settings, settings
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with a time-to-live
+
+    Entries expire `ttl_seconds` after they are stored; when the cache is
+    full the least recently used entry is evicted. A `max_entries` of 0
+    disables the cache entirely. With `max_bytes` and `sizeof`, the summed
+    size of the values is bounded too, and a value larger than the whole
+    budget is not stored.
+
+    Reads that miss should call `token()` before loading the value and pass
+    it to `set()`; if any invalidation happened in between, the value may
+    be stale and is not stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        max_bytes: int = 0,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        # key -> (expires_at, value, size)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._invalidations = 0
+        self._last_invalidated_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for a key, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value, _ = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def token(self) -> int:
+        """
+        Return the current invalidation counter for a later `set()`
+        """
+        return self._invalidations
+
+    def invalidated_within(self, seconds: float) -> bool:
+        """
+        Whether any entry was invalidated in the last `seconds` seconds
+
+        Values read from a lagging source (e.g. a read replica) during that
+        window may predate the invalidating write and should not be stored.
+        """
+        last = self._last_invalidated_at
+        return last is not None and self._clock() - last < seconds
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry if full
+
+        Args:
+            key: Cache key
+            value: Value to store
+            token: Result of `token()` taken before the value was loaded;
+                the value is dropped if an invalidation happened since
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if token is not None and token != self._invalidations:
+                return
+
+            size = self._sizeof(value) if self._sizeof is not None else 0
+            self._remove(key)
+            if self.max_bytes and size > self.max_bytes:
+                return
+
+            self._entries[key] = (self._clock() + self.ttl_seconds, value, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        # Callers hold the lock
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove a key so the next read reloads it
+        """
+        with self._lock:
+            self._invalidations += 1
+            self._last_invalidated_at = self._clock()
+            self._remove(key)
+
+    def reconfigure(self, max_entries: int, ttl_seconds: float, max_bytes: int = 0) -> None:
+        """
+        Change the size limits and time-to-live, dropping every entry
+        """
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl_seconds = ttl_seconds
+            self.max_bytes = max_bytes
+            self._invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def clear(self) -> None:
+        """
+        Remove every entry
+        """
+        with self._lock:
+            self._invalidations += 1
+            self._last_invalidated_at = self._clock()
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return counters and sizing information for monitoring
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+def _book_cache_options(settings: Settings) -> Dict[str, Any]:
+    return {
+        "max_entries": settings.book_cache_max_entries,
+        "ttl_seconds": settings.book_cache_ttl_seconds,
+    }
+
+
+# Serialized `BookSchema` payloads and their validators keyed by book id
+book_cache = LRUCache(**_book_cache_options(settings))
+
+
+def apply_settings(settings: Settings) -> None:
+    """
+    Resize `book_cache` for new settings (see `app.main.create_app`)
+    """
+    book_cache.reconfigure(**_book_cache_options(settings))
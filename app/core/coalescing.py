@@ -0,0 +1,122 @@
+"""
+Single-flight coalescing of identical concurrent reads for Reactive Hub API
+
+During a burst many clients ask for the same page or book at the same
+moment, and each request would run the same query on its own connection.
+A `SingleFlight` lets the first request for a key run the load while
+identical requests arriving meanwhile await its result:
+
+- Callers pass a key built from the normalized request (parsed parameters
+  with defaults applied, so `?limit=100&curation_status=approved` and the
+  same parameters in another order share) and a coroutine function.
+- The load runs as its own task, so a leader whose client disconnects does
+  not fail the requests sharing its result. Errors (including
+  `HTTPException`) are raised to every caller of that load.
+- Results are shared as-is and must not be modified by callers.
+- Once the load finishes the key is released; later requests start a new
+  load. `forget()` releases every key early, so requests arriving after a
+  write never receive a result loaded before it.
+
+Flights are per process: each worker coalesces its own requests.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.core.config import Settings, settings
+
+T = TypeVar("T")
+
+LIST_BOOKS = "list_books"
+GET_BOOK = "get_book"
+
+
+class SingleFlight:
+    """
+    Shares one in-flight load between identical concurrent callers
+
+    Args:
+        name: Route name, for stats
+        enabled: Coalesce calls; when False every call runs its own load
+    """
+
+    def __init__(self, name: str, enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.loads = 0
+        self.shared = 0
+        self.errors = 0
+
+    async def run(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return the result of `load()`, sharing a call already in flight for `key`
+
+        Args:
+            key: Identifies requests that have the same result
+            load: Coroutine function producing the result
+
+        Returns:
+            The (possibly shared) result
+        """
+        if not self.enabled:
+            return await load()
+
+        task = self._calls.get(key)
+        if task is None:
+            self.loads += 1
+            task = asyncio.ensure_future(load())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.shared += 1
+        # Shielded: a cancelled caller must not cancel the others' load
+        return await asyncio.shield(task)
+
+    def forget(self) -> None:
+        """
+        Release every in-flight key so later callers start a new load
+
+        Callers already waiting still receive their load's result.
+        """
+        self._calls.clear()
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieving the exception also keeps asyncio from logging it as
+        # unretrieved when every caller was cancelled
+        if task.cancelled() or task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.loads + self.shared
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._calls),
+            "loads": self.loads,
+            "shared": self.shared,
+            "errors": self.errors,
+            "share_ratio": round(self.shared / requests, 4) if requests else 0.0,
+        }
+
+
+def _enabled_routes(settings: Settings) -> Dict[str, bool]:
+    return {
+        LIST_BOOKS: settings.single_flight_list_books,
+        GET_BOOK: settings.single_flight_get_book,
+    }
+
+
+# Coalesced book reads of this process by route (see app.api.v1.endpoints.books)
+book_read_flights: Dict[str, SingleFlight] = {
+    name: SingleFlight(name, enabled=enabled) for name, enabled in _enabled_routes(settings).items()
+}
+
+
+def apply_settings(settings: Settings) -> None:
+    """
+    Enable or disable each route's coalescing for new settings (see `app.main.create_app`)
+    """
+    for name, enabled in _enabled_routes(settings).items():
+        book_read_flights[name].enabled = enabled
@@ -0,0 +1,120 @@
+"""
+HTTP conditional request helpers for Reactive Hub API
+
+This module builds validators (ETag, Last-Modified) for resources and
+evaluates the conditional request headers clients send back
+(If-None-Match, If-Modified-Since), following RFC 9110. If-Match is
+evaluated by the writes themselves (see `parse_entity_etag`).
+
+Entity ETags have the form `"<id>-v<version>"`: the row version is
+incremented by every write, so they change on every update (even two in
+the same clock tick) and can be decoded back into the version they were
+made from, so writes can check If-Match in their WHERE clause.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, List, Optional, Tuple
+
+
+def entity_etag(entity_id: int, version: int, variant: Optional[str] = None) -> str:
+    """
+    Build the strong ETag of a single record
+
+    Args:
+        entity_id: Primary key of the record
+        version: Row version of the record
+        variant: Distinguishes partial representations (e.g. a field list)
+            from the full one, which has no variant; must not contain
+            commas or quotes
+
+    Returns:
+        str: Quoted ETag value
+    """
+    suffix = f";{variant}" if variant else ""
+    return f'"{entity_id}-v{version}{suffix}"'
+
+
+def parse_entity_etag(etag: str) -> Optional[Tuple[int, int]]:
+    """
+    Decode an ETag produced by `entity_etag`
+
+    Returns:
+        Optional[Tuple[int, int]]: (id, version), or None if the value is
+        not the ETag of a full entity representation
+    """
+    value = etag.strip()
+    if not (len(value) >= 2 and value[0] == value[-1] == '"'):
+        return None
+
+    entity_id, _, version = value[1:-1].partition("-v")
+    if not (entity_id.isdigit() and version.isdigit()):
+        return None
+    return int(entity_id), int(version)
+
+
+def collection_etag(parts: Iterable[object]) -> str:
+    """
+    Build a strong ETag from the values that determine a collection response
+
+    Args:
+        parts: Request parameters and response content (bytes are hashed
+            as-is, anything else by its repr), in a stable order
+
+    Returns:
+        str: Quoted ETag value
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def http_date(value: datetime) -> str:
+    """
+    Format a timestamp as an HTTP date (naive values are taken as UTC)
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_list(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches_none_match(if_none_match: str, etag: str) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison)
+
+    Returns:
+        bool: True if the client's copy is current and 304 can be returned
+    """
+    tags = _etag_list(if_none_match)
+    return "*" in tags or any(_opaque(tag) == _opaque(etag) for tag in tags)
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """
+    Evaluate If-Modified-Since at HTTP date (one second) precision
+
+    Returns:
+        bool: True if the resource has not changed since the given date;
+        False if it has or the header cannot be parsed
+    """
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
@@ -2,15 +2,54 @@
 Configuration management for Reactive Hub API
 
 This module handles all application configuration using Pydantic Settings.
-It automatically loads environment variables from .env file and provides
+It loads environment variables (and the project's .env file) and provides
 type-safe configuration access throughout the application.
+
+`settings` stands in for the active Settings instance, which is read from
+the environment on first use or installed explicitly with `configure()`
+(as `app.main.create_app(settings)` does), so importing this module does
+no work.
 """
 
+import os
+from pathlib import Path
+from typing import List, Literal, Optional
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# The project's .env file, found regardless of the working directory
+PROJECT_ENV_FILE = Path(__file__).resolve().parents[2] / ".env"
+
+# Environment name that enables the production profile (see Settings)
+PRODUCTION_ENVIRONMENT = "production"
+
+# asyncio driver used for each database backend by the async engine
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Swap the driver of a database URL for its asyncio counterpart
+    
+    Args:
+        url: Database connection URL
+        
+    Returns:
+        str: The URL using asyncpg (PostgreSQL) or aiosqlite (SQLite);
+        other backends are returned unchanged
+    """
+    # Deferred: SQLAlchemy is slow to import and most callers never need this
+    from sqlalchemy.engine import make_url
+
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver:
+        parsed = parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}")
+    return parsed.render_as_string(hide_password=False)
 
 
 class Settings(BaseSettings):
@@ -19,12 +58,15 @@ class Settings(BaseSettings):
     
     Automatically loads configuration from environment variables
     with type validation and default values.
+    
+    With `environment="production"` the production profile applies:
+    debug mode and SQL echo are forced off whatever else is configured.
     """
     
     # Application configuration
     project_name: str = "Reactive Hub API"
     debug: bool = True
-    environment: str = "development"
+    environment: str = "development"   # "production" enables the production profile
     
     # Server configuration
     port: int = 3001
@@ -42,25 +84,246 @@ class Settings(BaseSettings):
     database_password: str = "password"
     database_name: str = "myapidb"
     
+    # Full connection URL; overrides the individual parameters above when set
+    # (e.g. "sqlite:///./test.db" for test runs)
+    database_uri: Optional[str] = None
+    
+    # Read replicas: comma-separated connection URLs. Book list/detail reads
+    # go to a replica unless the client wrote within replica_sticky_seconds.
+    database_replica_uris: str = ""
+    replica_selection: Literal["round_robin", "least_load"] = "round_robin"
+    replica_sticky_seconds: float = 5.0        # Read-your-writes window after a write
+    replica_max_lag_seconds: float = 5.0       # Replicas lagging more are skipped
+    replica_check_interval_seconds: float = 5.0  # Delay between replica lag checks
+    
+    # Serve requests through the native async engine. Set to False to run the
+    # same endpoints on the sync engine in a thread pool (for comparison).
+    database_async: bool = True
+    
+    # Production runner (python -m app.cli.serve)
+    workers: int = 0                     # Worker processes; 0 = one per CPU core
+    graceful_timeout_seconds: int = 30   # Time in-flight requests get to finish on restart/shutdown
+    
+    # Total connections all workers may open to each database; keep it below
+    # the server's max_connections. Each worker's pool_size + max_overflow is
+    # capped at db_max_connections // workers. 0 = no budget.
+    db_max_connections: int = 0
+    
+    # Connection pool configuration (per engine, per process)
+    db_pool_size: int = 5               # Connections kept open in the pool
+    db_max_overflow: int = 10           # Extra connections opened under load
+    db_pool_timeout: float = 30.0       # Seconds to wait for a free connection
+    db_pool_recycle: int = 3600         # Seconds before a connection is replaced
+    db_pool_pre_ping: bool = False      # Test connections on checkout (drops stale ones)
+    db_pool_use_lifo: bool = False      # Reuse the most recent connection first (lets idle ones expire)
+    
+    # Fail fast when the pool is exhausted: wait at most db_pool_fast_fail_timeout
+    # seconds, then answer 503 with Retry-After instead of holding the request
+    db_pool_fast_fail: bool = False
+    db_pool_fast_fail_timeout: float = 0.5
+    db_pool_retry_after_seconds: int = 1  # Retry-After sent with pool exhaustion 503s
+    
+    # Admission control: per route class (reads, writes) concurrency limits
+    # that adapt to latency (AIMD); requests over the limit wait in a bounded
+    # queue and are shed when it is full or the wait times out
+    admission_control_enabled: bool = True
+    admission_read_limit: int = 16              # Initial concurrent reads per process
+    admission_write_limit: int = 8              # Initial concurrent writes per process
+    admission_min_limit: int = 1                # Adaptive limits never go below this
+    admission_max_limit: int = 256              # ...or above this
+    admission_target_latency_ms: float = 250.0  # Time to first byte above which limits shrink
+    admission_queue_size: int = 64             # Requests that may wait per class
+    admission_queue_timeout_seconds: float = 1.0  # Longest wait before a request is shed
+    admission_health_limit: int = 16            # Fixed limit for health checks (never queued)
+    admission_shed_status: Literal[429, 503] = 503
+    admission_retry_after_seconds: int = 1      # Retry-After sent with shed responses
+    
+    # Background database health probe (serves /health endpoints)
+    health_probe_interval_seconds: float = 5.0   # Delay between probes
+    health_probe_timeout_seconds: float = 2.0    # A probe slower than this counts as failed
+    health_max_staleness_seconds: float = 30.0   # Probe live when the cached result is older
+    
+    # SQL diagnostics
+    sql_echo: bool = False                  # Log every SQL statement (very verbose)
+    slow_query_threshold_ms: float = 200.0  # Log statements slower than this
+    slow_query_log_parameters: bool = True  # Include bound parameters in slow-query logs
+    slow_query_explain: bool = False        # Attach EXPLAIN (ANALYZE, BUFFERS) to slow SELECTs (PostgreSQL; re-runs them)
+    n_plus_one_threshold: int = 10          # Report a statement repeated this often in one request; 0 disables
+    
+    # Request/database metrics served at /metrics in Prometheus format
+    metrics_enabled: bool = True
+    
+    # Entity cache configuration (per process)
+    book_cache_max_entries: int = 10000  # Books kept in the cache; 0 disables it
+    book_cache_ttl_seconds: float = 60.0  # Seconds before a cached book is reloaded
+    
+    # Paginated total count cache (the "cached" count strategy)
+    count_cache_max_entries: int = 1024  # Filter combinations kept; 0 disables it
+    count_cache_ttl_seconds: float = 30.0  # Seconds a cached total is reused
+    
+    # Idempotency-Key support for POST /books and the bulk endpoints (per process)
+    idempotency_max_keys: int = 10000              # Stored responses; 0 disables the header
+    idempotency_ttl_seconds: float = 86400.0       # How long a key's response is replayed
+    idempotency_wait_timeout_seconds: float = 30.0  # A duplicate waits this long for the original, then 409
+    idempotency_max_body_bytes: int = 1048576      # Larger responses are not stored (retries run again); 0 = no limit
+    idempotency_max_bytes: int = 67108864          # Total stored response bytes; 0 = no limit
+    
+    # Single-flight coalescing of identical concurrent reads, per route (per process)
+    single_flight_list_books: bool = True  # GET /books: identical list requests in flight share one query
+    single_flight_get_book: bool = True    # GET /books/{id}: concurrent cache misses of a book share one load
+    
+    # Bulk transfer configuration
+    bulk_max_items: int = 10000         # Maximum items accepted per bulk request
+    bulk_insert_chunk_size: int = 1000  # Rows per multi-row INSERT statement
+    bulk_update_chunk_size: int = 1000  # Rows per bulk status/delete UPDATE (and transaction)
+    export_batch_size: int = 1000       # Rows fetched per server-side cursor batch
+    import_batch_size: int = 5000       # Rows written per COPY/executemany batch
+    import_max_reported_rejections: int = 1000  # Rejected rows listed in import summaries
+    import_max_record_bytes: int = 1048576      # Longer lines/records are rejected (bounds parser memory)
+    
+    @model_validator(mode="after")
+    def apply_production_profile(self) -> "Settings":
+        """
+        Force off settings that must never be on in production
+        """
+        if self.is_production:
+            self.debug = False
+            self.sql_echo = False
+        return self
+    
+    @property
+    def is_production(self) -> bool:
+        """
+        Whether the production profile applies
+        """
+        return self.environment.lower() == PRODUCTION_ENVIRONMENT
+    
+    @property
+    def worker_count(self) -> int:
+        """
+        Number of worker processes the production runner starts
+        
+        Returns:
+            int: `workers`, or the number of CPU cores when it is 0
+        """
+        return self.workers if self.workers > 0 else (os.cpu_count() or 1)
+    
     @property
     def database_url(self) -> str:
         """
         Generate complete database URL from individual parameters
         
         Returns:
-            str: Complete PostgreSQL connection URL
+            str: Complete database connection URL
         """
+        if self.database_uri:
+            return self.database_uri
+        
         return (
-            f"postgresql://{self.database_user}:{self.database_password}"
+            f"postgresql+psycopg2://{self.database_user}:{self.database_password}"
             f"@{self.database_host}:{self.database_port}/{self.database_name}"
         )
     
+    @property
+    def pool_wait_timeout(self) -> float:
+        """
+        Seconds a request may wait for a pooled connection
+        
+        Returns:
+            float: The fast-fail timeout when fast-fail mode is on,
+            otherwise `db_pool_timeout`
+        """
+        if self.db_pool_fast_fail:
+            return self.db_pool_fast_fail_timeout
+        return self.db_pool_timeout
+    
+    @property
+    def async_database_url(self) -> str:
+        """
+        Generate the database URL for the async engine
+        
+        Swaps the driver of `database_url` for its asyncio counterpart
+        (asyncpg for PostgreSQL, aiosqlite for SQLite).
+        
+        Returns:
+            str: Database connection URL using an async driver
+        """
+        return to_async_url(self.database_url)
+    
+    @property
+    def replica_database_urls(self) -> List[str]:
+        """
+        Parse the comma-separated read replica URLs
+        
+        Returns:
+            List[str]: Replica connection URLs (empty when none are configured)
+        """
+        return [url.strip() for url in self.database_replica_uris.split(",") if url.strip()]
+    
     class Config:
         """Pydantic configuration"""
-        env_file = ".env"
+        # Later files take priority: a .env in the working directory
+        # overrides the project's
+        env_file = (PROJECT_ENV_FILE, ".env")
         env_file_encoding = "utf-8"
 
 
-# Create global settings instance
-# This will be imported and used throughout the application
-settings = Settings() 
\ No newline at end of file
+_active_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """
+    Return the active settings, reading them from the environment on first use
+    
+    Returns:
+        Settings: The process-wide settings
+    """
+    global _active_settings
+    if _active_settings is None:
+        _active_settings = Settings()
+    return _active_settings
+
+
+def configure(new_settings: Settings) -> Settings:
+    """
+    Install the settings used by the rest of the application
+    
+    `create_app(settings)` calls this and then applies the settings to the
+    module-level objects (caches, limiters, health prober, replica set),
+    which otherwise take their configuration when first imported. Database
+    engines are created from the active settings on first use and
+    forgotten by `dispose_engines()` (on app shutdown).
+    
+    Args:
+        new_settings: Settings to use from now on
+        
+    Returns:
+        Settings: The installed settings
+    """
+    global _active_settings
+    _active_settings = new_settings
+    return new_settings
+
+
+class _SettingsProxy:
+    """
+    Forwards attribute access to the active Settings
+    
+    Lets modules keep `from app.core.config import settings` without
+    creating a Settings instance at import time.
+    """
+    
+    __slots__ = ()
+    
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(get_settings(), name, value)
+    
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
+# Global settings, imported and used throughout the application
+settings: Settings = _SettingsProxy()  # type: ignore[assignment] 
\ No newline at end of file
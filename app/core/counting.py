@@ -0,0 +1,100 @@
+"""
+Row counting strategies for paginated responses
+
+An exact `COUNT(*)` over a large filtered table can cost as much as the
+page query itself. This module lets callers choose how a total is
+produced:
+
+- exact: run `COUNT(*)` over the filtered query
+- estimated: ask the PostgreSQL planner for its row estimate (EXPLAIN);
+  other databases fall back to an exact count
+- cached: reuse an exact count for the same filters for a short TTL
+
+Every strategy reports which method actually produced the number.
+"""
+
+import json
+from enum import Enum
+from typing import Any, Dict, Hashable, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import Settings, settings
+
+
+class CountStrategy(str, Enum):
+    """
+    How a paginated response's total is produced
+    """
+
+    exact = "exact"
+    estimated = "estimated"
+    cached = "cached"
+
+
+def _count_cache_options(settings: Settings) -> Dict[str, Any]:
+    return {
+        "max_entries": settings.count_cache_max_entries,
+        "ttl_seconds": settings.count_cache_ttl_seconds,
+    }
+
+
+# Exact totals keyed by normalized filter combination
+count_cache = LRUCache(**_count_cache_options(settings))
+
+
+def apply_settings(settings: Settings) -> None:
+    """
+    Resize `count_cache` for new settings (see `app.main.create_app`)
+    """
+    count_cache.reconfigure(**_count_cache_options(settings))
+
+
+async def count_rows(
+    db: AsyncSession,
+    query,
+    strategy: CountStrategy,
+    cache_key: Hashable,
+) -> Tuple[int, CountStrategy]:
+    """
+    Count the rows matched by a query using the requested strategy
+
+    Args:
+        db: Async database session
+        query: Filtered SELECT without ordering or limits
+        strategy: Requested counting strategy
+        cache_key: Normalized filters identifying the query (for `cached`)
+
+    Returns:
+        Tuple[int, CountStrategy]: The total and the strategy that produced it
+    """
+    if strategy is CountStrategy.estimated and db.get_bind().dialect.name == "postgresql":
+        return await _estimated_count(db, query), CountStrategy.estimated
+
+    if strategy is CountStrategy.cached:
+        total = count_cache.get(cache_key)
+        if total is not None:
+            return total, CountStrategy.cached
+
+        token = count_cache.token()
+        total = await _exact_count(db, query)
+        count_cache.set(cache_key, total, token=token)
+        return total, CountStrategy.exact
+
+    return await _exact_count(db, query), CountStrategy.exact
+
+
+async def _exact_count(db: AsyncSession, query) -> int:
+    return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+
+async def _estimated_count(db: AsyncSession, query) -> int:
+    # Bound parameters cannot be passed to EXPLAIN, so render them inline;
+    # SQLAlchemy quotes literal values for the dialect.
+    sql = str(query.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+    plan = await db.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -4,31 +4,215 @@ Database configuration and connection management for Reactive Hub API
 This module sets up SQLAlchemy engine, session factory, and provides
 database connectivity for the application. It includes connection pooling
 and session management utilities.
+
+Two engines are configured from the same settings:
+- `get_engine()` / `get_session_factory()`: synchronous, for scripts and
+  table management
+- `get_async_engine()` / `get_async_session_factory()`: asyncio, used by
+  the API endpoints
+
+Engines are created on first use rather than at import, so only the one
+actually needed is built (and its driver imported). The application's
+lifespan disposes them on shutdown with `dispose_engines()`. The names
+`engine`, `SessionLocal`, `async_engine` and `AsyncSessionLocal` remain
+importable and resolve to the lazily created objects.
 """
 
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.metrics import install_query_hooks
+from app.core.query_log import install_query_log
+from app.core.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
+
+
+def pool_options() -> Dict[str, Any]:
+    """
+    Connection pool options shared by every engine (see Settings)
+    
+    With a connection budget (`settings.db_max_connections`) each worker
+    process gets its share: pool_size + max_overflow is capped at
+    budget // `settings.worker_count`.
+    """
+    pool_size, max_overflow = settings.db_pool_size, settings.db_max_overflow
+    if settings.db_max_connections > 0:
+        per_worker = max(settings.db_max_connections // settings.worker_count, 1)
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+    
+    return dict(
+        pool_size=pool_size,                        # Number of connections to maintain in pool
+        max_overflow=max_overflow,                  # Maximum number of connections beyond pool_size
+        pool_timeout=settings.pool_wait_timeout,    # Timeout in seconds for getting connection from pool
+        pool_recycle=settings.db_pool_recycle,      # Time in seconds to recycle connections
+        pool_pre_ping=settings.db_pool_pre_ping,    # Test connections before handing them out
+        pool_use_lifo=settings.db_pool_use_lifo,    # Hand out the most recently returned connection first
+    )
+
+
+def build_engine(url: str):
+    """
+    Create a sync engine with the application's pooling and instrumentation
+    
+    Args:
+        url: Database connection URL
+        
+    Returns:
+        Engine: Engine with a timed connection pool, metrics hooks and the
+        slow-query log installed
+    """
+    new_engine = create_engine(
+        url,
+        poolclass=TimedQueuePool,       # Records checkout wait times
+        echo=settings.sql_echo,         # Log every SQL query (see also the slow-query log)
+        echo_pool=False,                # Set to True to log connection pool events
+        **pool_options(),
+    )
+    _instrument(new_engine)
+    return new_engine
+
+
+def build_async_engine(url: str):
+    """
+    Create an async engine with the application's pooling and instrumentation
+    
+    Args:
+        url: Database connection URL using an async driver
+        
+    Returns:
+        AsyncEngine: Async counterpart of `build_engine`
+    """
+    new_engine = create_async_engine(
+        url,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        echo=settings.sql_echo,
+        echo_pool=False,
+        **pool_options(),
+    )
+    _instrument(new_engine.sync_engine)
+    return new_engine
+
+
+def _instrument(sync_engine) -> None:
+    # Count statements and database time per request for /metrics
+    if settings.metrics_enabled:
+        install_query_hooks(sync_engine)
+    # Log slow statements and detect repeated ones (N+1 queries)
+    install_query_log(sync_engine)
+
+
+# Primary engines and session factories, created on first use
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_engines_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """
+    Return the sync engine, creating it on first use
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        with _engines_lock:
+            if _engine is None:
+                _engine = build_engine(settings.database_url)
+                # Each instance of the factory is a database session
+                _session_factory = sessionmaker(
+                    autocommit=False,       # Don't auto-commit transactions
+                    autoflush=False,        # Don't auto-flush before queries
+                    bind=_engine,           # Bind to our database engine
+                )
+    return _engine
+
+
+def get_session_factory() -> sessionmaker:
+    """
+    Return the session factory of the sync engine
+    """
+    get_engine()
+    return _session_factory
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the async engine, creating it on first use
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        with _engines_lock:
+            if _async_engine is None:
+                _async_engine = build_async_engine(settings.async_database_url)
+                _async_session_factory = async_sessionmaker(
+                    bind=_async_engine,
+                    autoflush=False,
+                    expire_on_commit=False,  # Keep loaded attributes usable after commit
+                )
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    Return the session factory of the async engine
+    """
+    get_async_engine()
+    return _async_session_factory
+
+
+async def dispose_engines() -> None:
+    """
+    Close the pooled connections of the primary engines and forget them
+    
+    The next use creates fresh engines from the then-active settings.
+    """
+    global _engine, _session_factory, _async_engine, _async_session_factory
+    with _engines_lock:
+        engine, async_engine = _engine, _async_engine
+        _engine = _session_factory = _async_engine = _async_session_factory = None
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
+
+
+def _reset_pools_after_fork() -> None:
+    # A forked child must not share the parent's pooled connections: give
+    # each inherited engine a fresh pool, leaving the parent's connections
+    # open for the parent
+    for engine in (_engine, _async_engine.sync_engine if _async_engine is not None else None):
+        if engine is not None:
+            engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+# Names importable for compatibility; each resolves to the lazily created object
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "SessionLocal": get_session_factory,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_session_factory,
+}
+
+
+def __getattr__(name: str):
+    factory = _LAZY_ATTRIBUTES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
 
-# Create SQLAlchemy engine with connection pooling
-engine = create_engine(
-    settings.database_url,
-    pool_size=5,                    # Number of connections to maintain in pool
-    max_overflow=10,                # Maximum number of connections beyond pool_size
-    pool_timeout=30,                # Timeout in seconds for getting connection from pool
-    pool_recycle=3600,              # Time in seconds to recycle connections (1 hour)
-    echo=settings.debug,            # Log SQL queries when in debug mode
-    echo_pool=False,                # Set to True to log connection pool events
-)
-
-# Create SessionLocal class for database sessions
-# Each instance of SessionLocal will be a database session
-SessionLocal = sessionmaker(
-    autocommit=False,               # Don't auto-commit transactions
-    autoflush=False,                # Don't auto-flush before queries
-    bind=engine                     # Bind to our database engine
-)
 
 # Create Base class for our models
 # All database models will inherit from this Base class
@@ -51,21 +235,149 @@ def get_db():
         def read_items(db: Session = Depends(get_db)):
             return db.query(Item).all()
     """
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
         db.close()
 
 
+class ThreadedSession:
+    """
+    Async facade over a synchronous database session
+    
+    Runs each blocking Session call in the thread pool so async endpoints
+    can run unchanged on the sync engine. Used when `settings.database_async`
+    is False to compare throughput against the native async driver.
+    Only the subset of the AsyncSession API used by the endpoints is provided.
+    """
+    
+    def __init__(self, session: Session):
+        self.sync_session = session
+    
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+    
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+    
+    def get_bind(self):
+        return self.sync_session.get_bind()
+    
+    @property
+    def info(self):
+        return self.sync_session.info
+    
+    async def connection(self):
+        return await run_in_threadpool(self.sync_session.connection)
+    
+    async def execute(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, params, **kwargs)
+    
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kwargs)
+    
+    async def scalars(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, params, **kwargs)
+    
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+    
+    async def refresh(self, instance, **kwargs) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, **kwargs)
+    
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+    
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+    
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+    
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+    
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+    
+    async def stream(self, statement, params=None, **kwargs):
+        kwargs["execution_options"] = {**kwargs.get("execution_options", {}), "stream_results": True}
+        result = await run_in_threadpool(self.sync_session.execute, statement, params, **kwargs)
+        return ThreadedResult(result)
+
+
+class ThreadedResult:
+    """
+    Async facade over a streaming (server-side cursor) result
+    
+    Counterpart of AsyncResult for ThreadedSession: each batch of rows is
+    fetched in the thread pool.
+    """
+    
+    def __init__(self, result):
+        self.sync_result = result
+    
+    async def partitions(self, size=None):
+        batches = iter(self.sync_result.partitions(size))
+        while True:
+            # partitions() never yields an empty batch, so None marks the end
+            batch = await run_in_threadpool(next, batches, None)
+            if batch is None:
+                break
+            yield batch
+
+
+@asynccontextmanager
+async def async_session_scope(
+    async_factory: async_sessionmaker = None,
+    sync_factory: sessionmaker = None,
+) -> AsyncIterator[AsyncSession]:
+    """
+    Open a session for async code and close it when done
+    
+    Yields a native AsyncSession, or a ThreadedSession over the sync engine
+    when `settings.database_async` is False. Both expose the same awaitable
+    API, so callers do not need to know which one they got.
+    
+    Args:
+        async_factory: Session factory for the async engine (default: primary)
+        sync_factory: Session factory for the sync engine (default: primary)
+    
+    Yields:
+        AsyncSession: Database session for async code
+    """
+    if settings.database_async:
+        async with (async_factory or get_async_session_factory())() as session:
+            yield session
+    else:
+        session = ThreadedSession((sync_factory or get_session_factory())(expire_on_commit=False))
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def active_engine():
+    """
+    Return the engine that serves API requests
+    
+    Returns:
+        Engine: The async engine's sync core when `settings.database_async`
+        is True, otherwise the sync engine
+    """
+    return get_async_engine().sync_engine if settings.database_async else get_engine()
+
+
 def create_tables():
     """
     Create all database tables
     
     This function creates all tables defined by our SQLAlchemy models.
-    Typically called during application startup.
+    Handy for tests and throwaway databases; deployed databases are managed
+    with Alembic migrations instead (`alembic upgrade head`).
     """
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 
 def drop_tables():
@@ -75,4 +387,4 @@ def drop_tables():
     This function drops all tables. Use with caution!
     Typically used during development or testing.
     """
-    Base.metadata.drop_all(bind=engine) 
\ No newline at end of file
+    Base.metadata.drop_all(bind=get_engine()) 
\ No newline at end of file
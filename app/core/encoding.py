@@ -0,0 +1,41 @@
+"""
+Fast JSON encoding for Reactive Hub API
+
+This module exposes a single `dumps` used by hot response paths that
+build JSON directly from database rows instead of going through
+per-row Pydantic models. It uses orjson when installed and falls back to
+the standard library otherwise; both produce compact JSON with datetimes
+in ISO 8601 format, matching FastAPI's default output.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON
+
+    Args:
+        value: dicts, lists, strings, numbers, booleans, None and datetimes
+
+    Returns:
+        bytes: The encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
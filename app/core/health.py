@@ -0,0 +1,190 @@
+"""
+Background database health probing for Reactive Hub API
+
+Load balancers poll the health endpoints many times per second. Instead
+of checking out a pooled connection for every poll, a background task
+probes the database every `settings.health_probe_interval_seconds` and
+keeps the latest result; the endpoints serve that result together with
+its age. A live probe is still available on request (`?deep=true`).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import Settings, settings
+from app.core.database import active_engine, async_session_scope
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """
+    Outcome of one database probe
+
+    Attributes:
+        connected: Whether the probe query succeeded
+        latency_ms: Time the probe took, including the pool checkout
+        checked_at: When the probe finished (UTC)
+        version: Database server version, when known
+        error: Failure reason when not connected
+        monotonic_at: Monotonic clock reading when the probe finished
+    """
+
+    connected: bool
+    latency_ms: float
+    checked_at: datetime
+    version: Optional[str] = None
+    error: Optional[str] = None
+    monotonic_at: float = 0.0
+
+    def staleness_seconds(self) -> float:
+        return round(time.monotonic() - self.monotonic_at, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "database": "connected" if self.connected else "disconnected",
+            "latency_ms": self.latency_ms,
+            "version": self.version,
+            "error": self.error,
+            "checked_at": self.checked_at.isoformat() + "Z",
+            "staleness_seconds": self.staleness_seconds(),
+        }
+
+
+class HealthProber:
+    """
+    Periodically probes the database and caches the latest result
+
+    Args:
+        interval_seconds: Delay between background probes
+        timeout_seconds: Maximum duration of a single probe
+        max_staleness_seconds: Age after which a cached result is no
+            longer served and a live probe runs instead (covers a stopped
+            or not yet started background task)
+    """
+
+    def __init__(self, interval_seconds: float, timeout_seconds: float, max_staleness_seconds: float):
+        self.reconfigure(interval_seconds, timeout_seconds, max_staleness_seconds)
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Task] = None
+
+    def reconfigure(self, interval_seconds: float, timeout_seconds: float, max_staleness_seconds: float) -> None:
+        """
+        Change the probe timing and forget the last result (it may describe another database)
+        """
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+        self.last_result: Optional[ProbeResult] = None
+
+    async def probe(self) -> ProbeResult:
+        """
+        Run a live probe now and cache its result
+
+        Concurrent callers on the same event loop share one probe.
+        """
+        inflight = self._inflight
+        if inflight is None or inflight.done() or inflight.get_loop() is not asyncio.get_running_loop():
+            inflight = self._inflight = asyncio.ensure_future(self._probe())
+        return await asyncio.shield(inflight)
+
+    async def current(self) -> ProbeResult:
+        """
+        Return the cached result, probing live if there is none or it is too old
+        """
+        result = self.last_result
+        if result is None or result.staleness_seconds() > self.max_staleness_seconds:
+            return await self.probe()
+        return result
+
+    async def _probe(self) -> ProbeResult:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._query(), timeout=self.timeout_seconds)
+            version_info = active_engine().dialect.server_version_info
+        except Exception as e:
+            result = self._failure(start, e)
+        else:
+            result = self._result(
+                start,
+                connected=True,
+                version=".".join(str(part) for part in version_info) if version_info else None,
+            )
+        self.last_result = result
+        return result
+
+    async def _query(self) -> None:
+        async with async_session_scope() as db:
+            await db.execute(text("SELECT 1"))
+
+    def _failure(self, start: float, error: Exception) -> ProbeResult:
+        # TimeoutError's message is empty; name the exception instead
+        return self._result(start, connected=False, error=str(error) or type(error).__name__)
+
+    def _result(
+        self,
+        start: float,
+        connected: bool,
+        version: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> ProbeResult:
+        return ProbeResult(
+            connected=connected,
+            latency_ms=round((time.perf_counter() - start) * 1000, 3),
+            checked_at=datetime.utcnow(),
+            version=version,
+            error=error,
+            monotonic_at=time.monotonic(),
+        )
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            try:
+                await self.probe()
+            except Exception as e:
+                # Anything escaping the probe (e.g. the engine cannot be
+                # created) counts as a failed probe; the loop keeps running
+                self.last_result = self._failure(start, e)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """
+        Start probing in the background on the running event loop
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background probe task
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _prober_options(settings: Settings) -> Dict[str, Any]:
+    return {
+        "interval_seconds": settings.health_probe_interval_seconds,
+        "timeout_seconds": settings.health_probe_timeout_seconds,
+        "max_staleness_seconds": settings.health_max_staleness_seconds,
+    }
+
+
+health_prober = HealthProber(**_prober_options(settings))
+
+
+def apply_settings(settings: Settings) -> None:
+    """
+    Reconfigure `health_prober` for new settings (see `app.main.create_app`)
+    """
+    health_prober.reconfigure(**_prober_options(settings))
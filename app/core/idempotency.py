@@ -0,0 +1,332 @@
+"""
+Idempotency-Key support for Reactive Hub API
+
+Clients that time out and retry a POST would otherwise run the write
+again, adding load when the database is slowest and creating duplicates.
+A request carrying an `Idempotency-Key` header on one of the configured
+routes is handled at most once per key:
+
+- The first request runs normally; its response (status, headers, body)
+  is stored under (route, caller, key) for `settings.idempotency_ttl_seconds`.
+  The caller is identified by a hash of the `Authorization` header when
+  one is sent, so one client cannot replay another's response.
+- Retries with the same key get the stored response, marked with an
+  `Idempotent-Replayed: true` header, without reaching the endpoint.
+- A duplicate arriving while the first request is still running waits for
+  it (up to `settings.idempotency_wait_timeout_seconds`, then 409) and is
+  answered with its response.
+- Reusing a key with a different request body is rejected with 422.
+
+Server errors (5xx) and redirects are not stored, so a failed request
+can be retried. Neither are responses larger than
+`settings.idempotency_max_body_bytes`: a retry of such a request runs
+again (duplicates in flight still wait for the original).
+
+The store is bounded by key count and by total body size
+(`settings.idempotency_max_bytes`) and is in-process: each worker keeps
+its own keys, which suits a single node; behind several workers or nodes
+a retry only replays when it reaches the same worker.
+"""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from app.core.cache import LRUCache
+from app.core.config import Settings, settings
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+AUTHORIZATION_HEADER = b"authorization"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+# Response headers that describe the original exchange and are not replayed
+UNREPLAYED_HEADERS = {b"set-cookie", b"date", b"server"}
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """
+    A completed response kept for replay
+
+    Attributes:
+        fingerprint: Hash of the request body and query string
+        status: HTTP status code
+        headers: Response headers to replay
+        body: Complete response body
+    """
+
+    fingerprint: str
+    status: int
+    headers: Tuple[Tuple[bytes, bytes], ...]
+    body: bytes
+
+
+class IdempotencyStore:
+    """
+    Stored responses by idempotency key, and the requests still in flight
+
+    Args:
+        max_keys: Responses kept; the least recently used are evicted. 0 disables
+        ttl_seconds: How long a response is replayed
+        wait_timeout_seconds: How long a duplicate waits for the in-flight original
+        max_body_bytes: Larger response bodies are not stored. 0 = no limit
+        max_bytes: Total size of the stored bodies; the least recently used
+            are evicted. 0 = no limit
+    """
+
+    def __init__(
+        self,
+        max_keys: int,
+        ttl_seconds: float,
+        wait_timeout_seconds: float,
+        max_body_bytes: int = 0,
+        max_bytes: int = 0,
+    ):
+        self.responses = LRUCache(
+            max_entries=max_keys,
+            ttl_seconds=ttl_seconds,
+            max_bytes=max_bytes,
+            sizeof=lambda stored: len(stored.body),
+        )
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.max_body_bytes = max_body_bytes
+        # key -> (fingerprint, future resolved when the original finishes)
+        self.inflight: Dict[Hashable, Tuple[str, asyncio.Future]] = {}
+        self.replays = 0
+        self.waits = 0
+        self.mismatches = 0
+        self.wait_timeouts = 0
+        self.too_large = 0
+
+    def reconfigure(
+        self,
+        max_keys: int,
+        ttl_seconds: float,
+        wait_timeout_seconds: float,
+        max_body_bytes: int = 0,
+        max_bytes: int = 0,
+    ) -> None:
+        """
+        Change the limits, dropping every stored response
+        """
+        self.responses.reconfigure(max_entries=max_keys, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.max_body_bytes = max_body_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self.responses.enabled
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.responses.stats(),
+            "in_flight": len(self.inflight),
+            "replays": self.replays,
+            "waits": self.waits,
+            "mismatches": self.mismatches,
+            "wait_timeouts": self.wait_timeouts,
+            "max_body_bytes": self.max_body_bytes,
+            "too_large": self.too_large,
+        }
+
+
+def _store_options(settings: Settings) -> Dict[str, Any]:
+    return {
+        "max_keys": settings.idempotency_max_keys,
+        "ttl_seconds": settings.idempotency_ttl_seconds,
+        "wait_timeout_seconds": settings.idempotency_wait_timeout_seconds,
+        "max_body_bytes": settings.idempotency_max_body_bytes,
+        "max_bytes": settings.idempotency_max_bytes,
+    }
+
+
+idempotency_store = IdempotencyStore(**_store_options(settings))
+
+
+def apply_settings(settings: Settings) -> None:
+    """
+    Reconfigure `idempotency_store` for new settings (see `app.main.create_app`)
+    """
+    idempotency_store.reconfigure(**_store_options(settings))
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware honoring `Idempotency-Key` on selected POST routes
+
+    Args:
+        app: The wrapped ASGI app
+        paths: Request paths (without trailing slash) the header applies to
+        store: Where responses and in-flight requests are tracked
+    """
+
+    def __init__(self, app, paths: Iterable[str], store: IdempotencyStore = idempotency_store):
+        self.app = app
+        self.paths = {path.rstrip("/") for path in paths}
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "").rstrip("/") if scope["type"] == "http" else None
+        if path not in self.paths or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        key = _header(scope, IDEMPOTENCY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _error(400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(scope.get("query_string", b"") + b"\0" + body).hexdigest()
+        store_key = (path, _caller(scope), key)
+        store = self.store
+
+        while True:
+            stored: Optional[StoredResponse] = store.responses.get(store_key)
+            if stored is not None:
+                if stored.fingerprint != fingerprint:
+                    store.mismatches += 1
+                    await _mismatch()(scope, receive, send)
+                    return
+                store.replays += 1
+                await _replay(stored, send)
+                return
+
+            inflight = store.inflight.get(store_key)
+            if inflight is None:
+                break
+            inflight_fingerprint, done = inflight
+            if inflight_fingerprint != fingerprint:
+                store.mismatches += 1
+                await _mismatch()(scope, receive, send)
+                return
+
+            # Wait for the original, then replay its response (or, if it
+            # failed and stored nothing, run this request in its place)
+            store.waits += 1
+            try:
+                await asyncio.wait_for(asyncio.shield(done), timeout=store.wait_timeout_seconds)
+            except asyncio.TimeoutError:
+                store.wait_timeouts += 1
+                await _error(
+                    409,
+                    "A request with this Idempotency-Key is still being processed",
+                    headers={"Retry-After": str(max(int(store.wait_timeout_seconds), 1))},
+                )(scope, receive, send)
+                return
+
+        done = asyncio.get_running_loop().create_future()
+        store.inflight[store_key] = (fingerprint, done)
+        response_start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+        size = 0
+        too_large = False
+        complete = False
+
+        async def send_wrapper(message):
+            nonlocal size, too_large, complete
+            if message["type"] == "http.response.start":
+                response_start.update(message)
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                # Stop buffering once the body is too large to be stored
+                if store.max_body_bytes and size > store.max_body_bytes:
+                    too_large = True
+                    chunks.clear()
+                if not too_large:
+                    chunks.append(chunk)
+                complete = not message.get("more_body", False)
+            await send(message)
+
+        try:
+            await self.app(scope, _replay_receive(body, receive), send_wrapper)
+        finally:
+            status_code = response_start.get("status", 500)
+            if too_large:
+                store.too_large += 1
+            elif complete and _storable(status_code):
+                store.responses.set(store_key, StoredResponse(
+                    fingerprint=fingerprint,
+                    status=status_code,
+                    headers=tuple(
+                        (name, value)
+                        for name, value in response_start.get("headers", [])
+                        if name.lower() not in UNREPLAYED_HEADERS
+                    ),
+                    body=b"".join(chunks),
+                ))
+            del store.inflight[store_key]
+            done.set_result(None)
+
+
+def _storable(status_code: int) -> bool:
+    # Not redirects (e.g. the trailing-slash redirect, which must be
+    # followed to the endpoint) and not server errors (retrying may succeed)
+    return status_code < 300 or 400 <= status_code < 500
+
+
+def _caller(scope) -> Optional[str]:
+    # Hashed so credentials are not kept in the store
+    authorization = _header(scope, AUTHORIZATION_HEADER)
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode("latin-1")).hexdigest()
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for header_name, value in scope.get("headers", []):
+        if header_name.lower() == name:
+            return value.decode("latin-1").strip()
+    return None
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_receive(body: bytes, receive):
+    # Hand the already read body to the app, then defer to the server
+    # (e.g. for disconnect notifications)
+    sent = False
+
+    async def replay_receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay_receive
+
+
+async def _replay(stored: StoredResponse, send) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": stored.status,
+        "headers": [*stored.headers, (REPLAYED_HEADER, b"true")],
+    })
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+def _mismatch() -> JSONResponse:
+    return _error(422, "Idempotency-Key was already used with a different request body")
+
+
+def _error(status_code: int, detail: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse({"detail": detail}, status_code=status_code, headers=headers)
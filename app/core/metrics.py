@@ -0,0 +1,300 @@
+"""
+Request and database metrics for Reactive Hub API
+
+This module records, per route template (e.g. `/api/v1/books/{book_id}`):
+- request latency
+- SQL statements executed per request
+- time spent in the database per request
+- time spent waiting for a pooled connection per request
+
+Latencies are kept in fixed-bucket histograms and rendered in the
+Prometheus text exposition format by the `/metrics` endpoint.
+
+Recording is cheap enough to stay on in production: the middleware is
+plain ASGI, per-request counters live in a context variable, and each
+observation is a bisect plus a few additions under a lock. Metrics are
+per process; each worker exposes its own.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Route label for requests that matched no route (keeps label values bounded)
+UNMATCHED_ROUTE = "<unmatched>"
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class RequestStats:
+    """
+    Database activity of the request being served
+    """
+
+    __slots__ = ("statements", "db_seconds", "pool_wait_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """
+    Return the stats of the request being served, or None outside requests
+    """
+    return _request_stats.get()
+
+
+def record_pool_wait(seconds: float) -> None:
+    """
+    Add a connection checkout wait to the current request, if any
+    """
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of observations, one series per label set
+    """
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                yield f"{self.name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(series[-1])}"
+            yield f"{self.name}_count{_format_labels(labels)} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    The request histograms of this process
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "Request latency by route template.",
+            LATENCY_BUCKETS,
+        )
+        self.db_statements = Histogram(
+            "http_request_db_statements",
+            "SQL statements executed per request.",
+            STATEMENT_BUCKETS,
+        )
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds",
+            "Time spent executing SQL per request.",
+            LATENCY_BUCKETS,
+        )
+        self.pool_wait = Histogram(
+            "http_request_pool_wait_seconds",
+            "Time spent waiting for a pooled connection per request.",
+            LATENCY_BUCKETS,
+        )
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        stats: RequestStats,
+    ) -> None:
+        route_labels = (("method", method), ("route", route))
+        with self._lock:
+            self.request_duration.observe(route_labels + (("status", str(status_code)),), seconds)
+            self.db_statements.observe(route_labels, stats.statements)
+            self.db_duration.observe(route_labels, stats.db_seconds)
+            self.pool_wait.observe(route_labels, stats.pool_wait_seconds)
+
+    def render(self, extra: Iterable[str] = ()) -> str:
+        """
+        Render every metric in the Prometheus text format
+
+        Args:
+            extra: Additional, already formatted exposition lines
+
+        Returns:
+            str: The exposition document
+        """
+        with self._lock:
+            lines = [
+                line
+                for histogram in (self.request_duration, self.db_statements, self.db_duration, self.pool_wait)
+                for line in histogram.render()
+            ]
+        lines.extend(extra)
+        return "\n".join(lines) + "\n"
+
+
+def gauge(name: str, documentation: str, value: float, metric_type: str = "gauge") -> List[str]:
+    """
+    Format a single unlabeled gauge or counter
+    """
+    return [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} {metric_type}",
+        f"{name} {_format_value(value)}",
+    ]
+
+
+def labeled_gauge(
+    name: str,
+    documentation: str,
+    samples: Dict[str, float],
+    label: str,
+    metric_type: str = "gauge",
+) -> List[str]:
+    """
+    Format a gauge or counter with one sample per value of a single label
+    """
+    return [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} {metric_type}",
+        *(
+            f"{name}{_format_labels(((label, key),))} {_format_value(value)}"
+            for key, value in sorted(samples.items())
+        ),
+    ]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing each HTTP request and its database activity
+
+    The route label is the matched route's path template, read from the
+    scope after routing, so `/books/1` and `/books/2` share one series.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            self.registry.observe_request(
+                scope["method"],
+                route_template(scope),
+                status_code,
+                elapsed,
+                stats,
+            )
+
+
+def route_template(scope) -> str:
+    """
+    Return the path template of the route matched for a request
+
+    Args:
+        scope: ASGI scope of the request, after routing
+
+    Returns:
+        str: e.g. `/api/v1/books/{book_id}`, or UNMATCHED_ROUTE
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+
+    # Routes of included routers may carry only their own part of the
+    # template; the matched prefix is the leading segments of the path.
+    path_segments = scope["path"].split("/")
+    prefix_length = len(path_segments) - len(template.split("/")) + 1
+    if prefix_length <= 1:
+        return template
+    return "/".join(path_segments[:prefix_length]) + template
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    start = getattr(context, "_metrics_start", None)
+    if stats is not None and start is not None:
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - start
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """
+    Count statements and database time for requests run on an engine
+
+    Args:
+        engine: A sync Engine (use `async_engine.sync_engine` for async ones)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
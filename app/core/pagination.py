@@ -0,0 +1,60 @@
+"""
+Cursor pagination helpers for Reactive Hub API
+
+This module encodes and decodes the opaque cursors used by keyset
+(seek) pagination. A cursor records the position of the last row on a
+page so the next page can be fetched with an indexed range condition
+instead of an OFFSET scan.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded
+    """
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    Encode a cursor payload into an opaque URL-safe token
+
+    Args:
+        payload: JSON-serializable values describing the page position
+
+    Returns:
+        str: URL-safe base64 token without padding
+    """
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a token produced by `encode_cursor`
+
+    Args:
+        cursor: Opaque cursor token received from a client
+
+    Returns:
+        Dict[str, Any]: The original cursor payload
+
+    Raises:
+        InvalidCursorError: If the token is malformed or tampered with
+    """
+    padding = "=" * (-len(cursor) % 4)
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + padding)
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Malformed pagination cursor")
+
+    return payload
@@ -0,0 +1,132 @@
+"""
+Connection pool instrumentation for Reactive Hub API
+
+This module provides queue pools that record how long each checkout
+waited for a free connection and how many checkouts timed out, and a
+helper that reports a pool's live state (checked-out connections,
+overflow, wait statistics) for the health endpoints.
+
+When the pool is exhausted SQLAlchemy raises `sqlalchemy.exc.TimeoutError`
+after `pool_timeout` seconds; the API dependencies turn that into a 503
+response with a `Retry-After` header.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.metrics import record_pool_wait
+
+
+class PoolWaitStats:
+    """
+    Thread-safe counters for connection checkout waits
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.total_wait, 6),
+                "wait_seconds_avg": round(self.total_wait / attempts, 6) if attempts else 0.0,
+                "wait_seconds_max": round(self.max_wait, 6),
+            }
+
+
+class _TimedPoolMixin:
+    """
+    Times each checkout from the underlying queue
+
+    Statistics survive `recreate()`, which the engine calls on dispose()
+    and after connection invalidation. Each wait is also added to the
+    current request's metrics.
+    """
+
+    wait_stats: PoolWaitStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            waited = time.perf_counter() - start
+            self.wait_stats.record(waited, timed_out=True)
+            record_pool_wait(waited)
+            raise
+        waited = time.perf_counter() - start
+        self.wait_stats.record(waited)
+        record_pool_wait(waited)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """
+    QueuePool for the sync engine that records checkout waits
+    """
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool for the async engine that records checkout waits
+    """
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """
+    Describe the live state of a connection pool
+
+    Args:
+        pool: The engine's pool (`engine.pool`)
+
+    Returns:
+        Dict containing the pool class, configured size and timeout,
+        connections checked in/out, overflow connections in use and,
+        for timed pools, checkout wait statistics
+    """
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            # overflow() counts down from -size until the pool is full
+            "overflow": max(pool.overflow(), 0),
+            "timeout": pool.timeout(),
+        })
+
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status["wait"] = wait_stats.snapshot()
+
+    return status
@@ -0,0 +1,165 @@
+"""
+Slow-query log and N+1 detection for Reactive Hub API
+
+This module replaces SQL echo with two targeted diagnostics:
+
+- Slow-query log: statements slower than `settings.slow_query_threshold_ms`
+  are logged as one JSON object (statement, parameters, duration, route)
+  to the `app.sql.slow` logger. With `settings.slow_query_explain` the
+  PostgreSQL `EXPLAIN (ANALYZE, BUFFERS)` plan of slow SELECTs is captured
+  too; ANALYZE runs the statement a second time, so keep it off unless
+  investigating.
+- N+1 detector: a request that runs the same statement (same SQL text,
+  whatever the parameters) `settings.n_plus_one_threshold` times or more
+  is reported to the `app.sql.n_plus_one` logger when it finishes.
+"""
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.encoding import dumps
+from app.core.metrics import route_template
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+n_plus_one_logger = logging.getLogger("app.sql.n_plus_one")
+
+# Longest parameter representation written to the log
+MAX_PARAMETERS_LENGTH = 1000
+
+
+class RequestQueries:
+    """
+    Statements issued by the request being served
+    """
+
+    __slots__ = ("scope", "statements")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements: Counter = Counter()
+
+    def route(self) -> Dict[str, str]:
+        return {"method": self.scope["method"], "route": route_template(self.scope)}
+
+
+_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+class QueryLogMiddleware:
+    """
+    ASGI middleware attributing statements to requests
+
+    Makes the current route available to the slow-query log and reports
+    repeated statements once the request has finished.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _request_queries.set(queries)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_queries.reset(token)
+            _report_repeated_statements(queries)
+
+
+def _report_repeated_statements(queries: RequestQueries) -> None:
+    threshold = settings.n_plus_one_threshold
+    if threshold <= 0 or not queries.statements:
+        return
+
+    for statement, count in queries.statements.items():
+        if count >= threshold:
+            n_plus_one_logger.warning(dumps({
+                "event": "n_plus_one",
+                **queries.route(),
+                "count": count,
+                "statement": statement,
+            }).decode("utf-8"))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_log_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _request_queries.get()
+    if queries is not None and not executemany:
+        queries.statements[statement] += 1
+
+    start = getattr(context, "_query_log_start", None)
+    if start is None:
+        return
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms < settings.slow_query_threshold_ms:
+        return
+
+    record: Dict[str, Any] = {
+        "event": "slow_query",
+        "duration_ms": round(duration_ms, 3),
+        **(queries.route() if queries is not None else {}),
+        "statement": statement,
+        "executemany": executemany,
+    }
+    if settings.slow_query_log_parameters:
+        record["parameters"] = repr(parameters)[:MAX_PARAMETERS_LENGTH]
+    if settings.slow_query_explain and _explainable(conn, statement, executemany):
+        record["plan"] = _explain(conn, statement, parameters)
+
+    slow_query_logger.warning(dumps(record).decode("utf-8"))
+
+
+def _explainable(conn, statement: str, executemany: bool) -> bool:
+    # EXPLAIN ANALYZE executes the statement, so never repeat writes
+    return (
+        conn.dialect.name == "postgresql"
+        and not executemany
+        and statement.lstrip()[:6].upper() == "SELECT"
+    )
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    # Use a separate DBAPI cursor: the original one still holds the results,
+    # and statements run this way do not re-enter these event hooks.
+    # A savepoint keeps a failed EXPLAIN from aborting the transaction.
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return f"EXPLAIN failed: {e}"
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        cursor.close()
+
+
+def install_query_log(engine: Engine) -> None:
+    """
+    Log slow statements and count repeated ones for an engine
+
+    Args:
+        engine: A sync Engine (use `async_engine.sync_engine` for async ones)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,358 @@
+"""
+Read replica routing for Reactive Hub API
+
+Reads that tolerate slightly stale data can be served by read replicas
+configured in `settings.database_replica_uris`; everything else keeps
+using the primary. This module provides:
+
+- `ReplicaSet`: engines for each replica, replica selection
+  (round-robin or least checked-out connections) and a background check
+  that takes replicas out of rotation while they fail or lag more than
+  `settings.replica_max_lag_seconds`.
+- `ReadYourWritesMiddleware`: after a successful write, sets a short-lived
+  cookie that sends the client's reads to the primary for
+  `settings.replica_sticky_seconds`, so it sees its own changes.
+- `replica_session_scope`: opens a read session on a replica, falling back
+  to the primary when there is no usable replica or it cannot connect.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from functools import cached_property
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import Settings, get_settings, settings, to_async_url
+from app.core.database import async_session_scope, build_async_engine, build_engine
+from app.core.pool import pool_status
+
+# Cookie marking a client that wrote recently; its value is the Unix time
+# until which the client's reads go to the primary
+STICKY_COOKIE = "primary_until"
+
+# Session.info key naming the replica a session reads from
+REPLICA_INFO_KEY = "replica"
+
+# Lag of a PostgreSQL standby in seconds (0 when caught up or not a standby)
+POSTGRESQL_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    """
+    One read replica with its engines and last known state
+
+    Engines are created on first use, like the primary's.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        # Identify the replica in stats without exposing credentials
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @cached_property
+    def engine(self):
+        return build_engine(self.url)
+
+    @cached_property
+    def async_engine(self):
+        return build_async_engine(to_async_url(self.url))
+
+    @cached_property
+    def session_factory(self) -> sessionmaker:
+        return sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+    @cached_property
+    def async_session_factory(self) -> async_sessionmaker:
+        return async_sessionmaker(bind=self.async_engine, autoflush=False, expire_on_commit=False)
+
+    def reset_pools_after_fork(self) -> None:
+        """
+        Give the replica's engines fresh pools in a forked child process
+        """
+        for name in ("engine", "async_engine"):
+            engine = self.__dict__.get(name)
+            if engine is not None:
+                getattr(engine, "sync_engine", engine).dispose(close=False)
+
+    async def dispose(self) -> None:
+        """
+        Close the replica's pooled connections and forget its engines
+        """
+        engines = [self.__dict__.pop(name, None) for name in ("async_engine", "engine")]
+        self.__dict__.pop("session_factory", None)
+        self.__dict__.pop("async_session_factory", None)
+        async_engine, engine = engines
+        if async_engine is not None:
+            await async_engine.dispose()
+        if engine is not None:
+            engine.dispose()
+
+    @property
+    def created_engine(self):
+        """
+        The active engine if it exists yet, without creating it
+        """
+        if settings.database_async:
+            engine = self.__dict__.get("async_engine")
+            return engine.sync_engine if engine is not None else None
+        return self.__dict__.get("engine")
+
+    def checked_out(self) -> int:
+        engine = self.created_engine
+        return engine.pool.checkedout() if engine is not None else 0
+
+    def mark_failed(self, error: Exception) -> None:
+        self.healthy = False
+        self.last_error = str(error) or type(error).__name__
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "error": self.last_error,
+            "connection_pool": pool_status(self.created_engine.pool) if self.created_engine is not None else None,
+        }
+
+
+class ReplicaSet:
+    """
+    The configured read replicas
+
+    Args:
+        urls: Replica connection URLs
+        selection: "round_robin" or "least_load" (fewest checked-out connections)
+        max_lag_seconds: Replicas lagging more than this are not used
+        check_interval_seconds: Delay between background replica checks
+    """
+
+    def __init__(self, urls: List[str], selection: str, max_lag_seconds: float, check_interval_seconds: float):
+        self.replicas: List[Replica] = []
+        # Replicas replaced by `reconfigure`, whose engines `dispose` still closes
+        self._retired: List[Replica] = []
+        self._next = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.primary_fallbacks = 0
+        self.reconfigure(urls, selection, max_lag_seconds, check_interval_seconds)
+
+    def reconfigure(self, urls: List[str], selection: str, max_lag_seconds: float, check_interval_seconds: float) -> None:
+        """
+        Replace the replicas and selection settings
+
+        Engines of the previous replicas are closed by the next `dispose()`.
+        """
+        self._retired.extend(self.replicas)
+        self.replicas = [Replica(url) for url in urls]
+        self.selection = selection
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        """
+        Pick a healthy replica, or None if there is none
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.selection == "least_load":
+            return min(healthy, key=lambda replica: replica.checked_out())
+        return healthy[next(self._next) % len(healthy)]
+
+    async def check(self) -> None:
+        """
+        Measure each replica's lag and take failing or lagging ones out of rotation
+        """
+        for replica in self.replicas:
+            try:
+                async with _replica_scope(replica) as db:
+                    if db.get_bind().dialect.name == "postgresql":
+                        lag = float(await db.scalar(POSTGRESQL_LAG_QUERY) or 0)
+                    else:
+                        await db.execute(text("SELECT 1"))
+                        lag = 0.0
+            except Exception as e:
+                replica.mark_failed(e)
+                continue
+            replica.lag_seconds = round(lag, 3)
+            replica.healthy = lag <= self.max_lag_seconds
+            replica.last_error = None if replica.healthy else f"Replication lag {lag:.1f}s"
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval_seconds)
+
+    def start(self) -> None:
+        """
+        Start checking replicas in the background on the running event loop
+        """
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background replica checks
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset_pools_after_fork(self) -> None:
+        for replica in [*self.replicas, *self._retired]:
+            replica.reset_pools_after_fork()
+
+    async def dispose(self) -> None:
+        """
+        Close every replica's pooled connections
+        """
+        retired, self._retired = self._retired, []
+        for replica in [*self.replicas, *retired]:
+            await replica.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "selection": self.selection,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [replica.stats() for replica in self.replicas],
+        }
+
+
+def _replica_scope(replica: Replica):
+    # Only create the engine that serves requests
+    if settings.database_async:
+        return async_session_scope(async_factory=replica.async_session_factory)
+    return async_session_scope(sync_factory=replica.session_factory)
+
+
+def _replica_set_options(settings: Settings) -> Dict[str, Any]:
+    return {
+        "urls": settings.replica_database_urls,
+        "selection": settings.replica_selection,
+        "max_lag_seconds": settings.replica_max_lag_seconds,
+        "check_interval_seconds": settings.replica_check_interval_seconds,
+    }
+
+
+replica_set = ReplicaSet(**_replica_set_options(settings))
+
+
+def apply_settings(settings: Settings) -> None:
+    """
+    Reconfigure `replica_set` for new settings (see `app.main.create_app`)
+    """
+    replica_set.reconfigure(**_replica_set_options(settings))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=replica_set.reset_pools_after_fork)
+
+
+def is_sticky(cookies: Dict[str, str]) -> bool:
+    """
+    Whether a client wrote recently enough that it must read from the primary
+    """
+    value = cookies.get(STICKY_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    """
+    Whether a session reads from a replica (and may see slightly stale data)
+    """
+    return REPLICA_INFO_KEY in db.info
+
+
+@asynccontextmanager
+async def replica_session_scope(prefer_primary: bool = False) -> AsyncIterator[AsyncSession]:
+    """
+    Open a read session on a replica when possible
+
+    A connection is checked out up front, so a replica that cannot be
+    reached is taken out of rotation and the primary is used instead; a
+    replica whose pool is exhausted is skipped for this session only.
+
+    Args:
+        prefer_primary: Use the primary regardless (e.g. read-your-writes)
+
+    Yields:
+        AsyncSession: Session on a replica, or on the primary
+    """
+    replica = None if prefer_primary or not replica_set.enabled else replica_set.choose()
+    if replica is not None:
+        async with _replica_scope(replica) as db:
+            try:
+                await db.connection()
+            except PoolTimeoutError:
+                pass  # Busy rather than broken: spill over to the primary
+            except (DBAPIError, OSError) as e:
+                replica.mark_failed(e)
+            else:
+                db.info[REPLICA_INFO_KEY] = replica.name
+                yield db
+                return
+        replica_set.primary_fallbacks += 1
+
+    async with async_session_scope() as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware pinning a client's reads to the primary after it writes
+
+    Successful responses to non-safe methods (POST, PUT, PATCH, DELETE)
+    get a cookie valid for `sticky_seconds` (default: the active settings'
+    `replica_sticky_seconds`); `replica_session_scope` callers check it
+    with `is_sticky`.
+    """
+
+    SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(self, app, sticky_seconds: Optional[float] = None):
+        self.app = app
+        self.sticky_seconds = get_settings().replica_sticky_seconds if sticky_seconds is None else sticky_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                cookie = (
+                    f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(self.sticky_seconds) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,96 @@
+"""
+Book search backend for Reactive Hub API
+
+This module turns the `search` query parameter into an index-backed,
+ranked condition for the database in use:
+
+- PostgreSQL: `ILIKE` served by the `pg_trgm` GIN indexes on `title`
+  and `author`, ranked by trigram word similarity.
+- SQLite: the `books_fts` FTS5 table (trigram tokenizer), ranked by BM25.
+- Anything else: plain `ILIKE` with a constant rank.
+
+All backends keep the original case-insensitive substring semantics, so
+switching backends does not change which books match.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Double, cast, column, func, literal, or_, table
+
+from app.models.book import Book
+
+# Shortest term the trigram indexes can serve
+MIN_TRIGRAM_LENGTH = 3
+
+# Lightweight handle on the SQLite FTS5 shadow table created in app.models.book
+books_fts = table("books_fts", column("rowid"), column("rank"), column("books_fts"))
+
+
+@dataclass
+class SearchClause:
+    """
+    The pieces a list query needs to apply a search
+
+    Attributes:
+        condition: WHERE clause restricting rows to matches
+        rank: Relevance expression where higher values are better matches
+        join_fts: Whether the query must join `books_fts` for the condition
+    """
+
+    condition: Any
+    rank: Any
+    join_fts: bool = False
+
+
+def _like_pattern(term: str) -> str:
+    """
+    Build a substring LIKE pattern with wildcard characters escaped
+    """
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _ilike_condition(term: str):
+    pattern = _like_pattern(term)
+    return or_(
+        Book.title.ilike(pattern, escape="\\"),
+        Book.author.ilike(pattern, escape="\\"),
+    )
+
+
+def build_search(term: str, dialect_name: str) -> SearchClause:
+    """
+    Build the search condition and rank expression for a dialect
+
+    Args:
+        term: Raw search term from the client
+        dialect_name: SQLAlchemy dialect name of the session's bind
+
+    Returns:
+        SearchClause: Condition, rank and join requirements for the query
+    """
+    if dialect_name == "postgresql":
+        # Cast to double precision so the rank round-trips exactly through
+        # pagination cursors (word_similarity returns a float4).
+        rank = cast(
+            func.greatest(
+                func.word_similarity(term, Book.title),
+                func.word_similarity(term, Book.author),
+            ),
+            Double,
+        )
+        return SearchClause(condition=_ilike_condition(term), rank=rank)
+
+    if dialect_name == "sqlite" and len(term) >= MIN_TRIGRAM_LENGTH:
+        # Quote the term as a single FTS5 phrase; with the trigram tokenizer
+        # a phrase query is a case-insensitive substring match.
+        phrase = '"' + term.replace('"', '""') + '"'
+        # FTS5 rank is BM25 where lower is better, so flip the sign
+        return SearchClause(
+            condition=books_fts.c.books_fts.match(phrase),
+            rank=-books_fts.c.rank,
+            join_fts=True,
+        )
+
+    return SearchClause(condition=_ilike_condition(term), rank=literal(0.0, Double))
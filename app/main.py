@@ -2,75 +2,221 @@
 Reactive Hub API - Main Application
 
 This is the main entry point for the FastAPI application.
-It sets up the FastAPI instance, middleware, and routing.
+`create_app(settings)` sets up the FastAPI instance, middleware, and routing.
+
+Importing this module is cheap, which keeps cold starts of autoscaled
+replicas and test workers short: FastAPI, the routers and the database
+modules are imported inside the factory, database engines are created on
+first use and disposed on shutdown, and the module-level `app` (used by
+`uvicorn app.main:app`) is only built when first accessed.
 """
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import settings
-
-# Create FastAPI application instance
-app = FastAPI(
-    title=settings.project_name,
-    description="A modern backend API built with FastAPI, SQLAlchemy, and PostgreSQL",
-    version="1.0.0",
-    debug=settings.debug,
-)
-
-# Add CORS middleware for frontend communication
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[settings.frontend_url],  # Allow frontend origin
-    allow_credentials=True,                 # Allow cookies and auth headers
-    allow_methods=["*"],                    # Allow all HTTP methods
-    allow_headers=["*"],                    # Allow all headers
-)
-
-
-@app.get("/")
-async def root():
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import Settings, configure, get_settings
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+
+@asynccontextmanager
+async def lifespan(app: "FastAPI"):
     """
-    Root endpoint for basic health check
-    
-    Returns a welcome message and basic API information.
+    Application startup and shutdown
+
+    Runs the background database health prober and read replica checks
+    while the app is serving, and closes every pooled database connection
+    on shutdown.
     """
-    return {
-        "message": f"Welcome to {settings.project_name}!",
-        "status": "running",
-        "environment": settings.environment,
-        "api_docs": "/docs",
-        "api_version": settings.api_v1_str,
-    }
+    from app.core.database import dispose_engines
+    from app.core.health import health_prober
+    from app.core.replicas import replica_set
+
+    health_prober.start()
+    replica_set.start()
+    yield
+    await replica_set.stop()
+    await health_prober.stop()
+    await replica_set.dispose()
+    await dispose_engines()
 
 
-@app.get("/health")
-async def health_check():
+def create_app(settings: Optional[Settings] = None) -> "FastAPI":
     """
-    Health check endpoint
-    
-    Returns the current status of the API service.
-    Useful for monitoring and load balancer health checks.
+    Build the FastAPI application
+
+    Args:
+        settings: Settings to run with; they become the process-wide
+            settings (see `app.core.config.configure`) and are applied to
+            the module-level caches, limiters, health prober and replica
+            set. Defaults to the settings read from the environment.
+
+    Returns:
+        FastAPI: The configured application
     """
-    return {
-        "status": "healthy",
-        "service": settings.project_name,
-        "environment": settings.environment,
-    }
+    settings = configure(settings) if settings is not None else get_settings()
+
+    # Deferred imports: these pull in FastAPI, SQLAlchemy and every endpoint
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import PlainTextResponse
+    from app.api.v1.api import api_router
+    from app.api.v1.endpoints.books import IDEMPOTENT_PATHS
+    from app.core.admission import AdmissionControlMiddleware, admission_limiters
+    from app.core.coalescing import book_read_flights
+    from app.core.database import active_engine
+    from app.core.idempotency import IdempotencyMiddleware, idempotency_store
+    from app.core.metrics import PROMETHEUS_MEDIA_TYPE, MetricsMiddleware, gauge, labeled_gauge, metrics
+    from app.core.pool import pool_status
+    from app.core.query_log import QueryLogMiddleware
+    from app.core.replicas import ReadYourWritesMiddleware, replica_set
+    from app.core import admission, cache, coalescing, counting, health, idempotency, replicas
+
+    # These components are created when first imported; bring them in line
+    # with this app's settings (another app may have been built before it)
+    for component in (cache, counting, idempotency, admission, health, replicas, coalescing):
+        component.apply_settings(settings)
+
+    # Create FastAPI application instance
+    app = FastAPI(
+        title=settings.project_name,
+        description="A modern backend API built with FastAPI, SQLAlchemy, and PostgreSQL",
+        version="1.0.0",
+        debug=settings.debug,
+        lifespan=lifespan,
+    )
+
+    # Replay stored responses to retried creates and bulk changes (inside
+    # read-your-writes, so replays still pin the client to the primary)
+    if idempotency_store.enabled:
+        app.add_middleware(
+            IdempotencyMiddleware,
+            paths=[f"{settings.api_v1_str}/books{path}" for path in IDEMPOTENT_PATHS],
+        )
+
+    # Send clients that just wrote to the primary for their next reads
+    if replica_set.enabled:
+        app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=settings.replica_sticky_seconds)
 
+    # Attribute SQL statements to routes for the slow-query log and N+1 detector
+    app.add_middleware(QueryLogMiddleware)
 
-# Include API routers
-from app.api.v1.api import api_router
-app.include_router(api_router, prefix=settings.api_v1_str)
+    # Cap requests in flight per route class and shed the excess early
+    # (inside metrics, so shed requests are counted)
+    if settings.admission_control_enabled:
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            health_paths=["/health", "/metrics", f"{settings.api_v1_str}/health"],
+            shed_status=settings.admission_shed_status,
+            retry_after_seconds=settings.admission_retry_after_seconds,
+        )
+
+    # Add CORS middleware for frontend communication. Added after the
+    # middleware above so it wraps them: shed (503/429 + Retry-After) and
+    # idempotency responses get CORS headers too, and preflights are
+    # answered before admission control
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[settings.frontend_url],  # Allow frontend origin
+        allow_credentials=True,                 # Allow cookies and auth headers
+        allow_methods=["*"],                    # Allow all HTTP methods
+        allow_headers=["*"],                    # Allow all headers
+        expose_headers=["X-Next-Cursor", "ETag", "Idempotent-Replayed", "Retry-After"],  # Let browsers read cursors, validators, replays and backoff
+    )
+
+    # Record per-route latency and database timings (outermost, so it sees everything)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get("/")
+    async def root():
+        """
+        Root endpoint for basic health check
+
+        Returns a welcome message and basic API information.
+        """
+        return {
+            "message": f"Welcome to {settings.project_name}!",
+            "status": "running",
+            "environment": settings.environment,
+            "api_docs": "/docs",
+            "api_version": settings.api_v1_str,
+        }
+
+    @app.get("/health")
+    async def health_check():
+        """
+        Health check endpoint
+
+        Returns the current status of the API service.
+        Useful for monitoring and load balancer health checks.
+        """
+        return {
+            "status": "healthy",
+            "service": settings.project_name,
+            "environment": settings.environment,
+        }
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """
+        Prometheus metrics endpoint
+
+        Exposes request latency histograms per route template, SQL statement
+        counts and database time per request, connection pool state, and
+        admission control and single-flight counters for this worker process.
+        """
+        pool = pool_status(active_engine().pool)
+        wait = pool.get("wait", {})
+        lines = [
+            *gauge("db_pool_size", "Connections kept open in the pool.", pool.get("size", 0)),
+            *gauge("db_pool_checked_out", "Connections currently checked out.", pool.get("checked_out", 0)),
+            *gauge("db_pool_overflow", "Overflow connections currently open.", pool.get("overflow", 0)),
+            *gauge("db_pool_checkouts_total", "Connection checkouts.", wait.get("checkouts", 0), "counter"),
+            *gauge("db_pool_timeouts_total", "Checkouts that timed out.", wait.get("timeouts", 0), "counter"),
+            *gauge("db_pool_wait_seconds_total", "Time spent waiting for connections.", wait.get("wait_seconds_total", 0.0), "counter"),
+        ]
+        if settings.admission_control_enabled:
+            admission = {name: limiter.stats() for name, limiter in admission_limiters.items()}
+            lines += [
+                *labeled_gauge("admission_limit", "Current concurrency limit by route class.", {name: stats["limit"] for name, stats in admission.items()}, "class"),
+                *labeled_gauge("admission_in_flight", "Requests in flight by route class.", {name: stats["in_flight"] for name, stats in admission.items()}, "class"),
+                *labeled_gauge("admission_queue_length", "Requests waiting for a slot by route class.", {name: stats["queue_length"] for name, stats in admission.items()}, "class"),
+                *labeled_gauge("admission_shed_total", "Requests shed by route class.", {name: stats["shed_queue_full"] + stats["shed_timeout"] for name, stats in admission.items()}, "class", "counter"),
+            ]
+        flights = {name: flight.stats() for name, flight in book_read_flights.items()}
+        lines += [
+            *labeled_gauge("single_flight_loads_total", "Reads that ran their own load, by route.", {name: stats["loads"] for name, stats in flights.items()}, "route", "counter"),
+            *labeled_gauge("single_flight_shared_total", "Reads answered by an identical in-flight load, by route.", {name: stats["shared"] for name, stats in flights.items()}, "route", "counter"),
+            *labeled_gauge("single_flight_in_flight", "Loads in flight, by route.", {name: stats["in_flight"] for name, stats in flights.items()}, "route"),
+        ]
+        return PlainTextResponse(metrics.render(lines), media_type=PROMETHEUS_MEDIA_TYPE)
+
+    # Include API routers
+    app.include_router(api_router, prefix=settings.api_v1_str)
+
+    return app
+
+
+def __getattr__(name: str):
+    # Build the default app on first access of `app.main.app`, not at import
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Development server startup
 if __name__ == "__main__":
     import uvicorn
-    
+
+    settings = get_settings()
     uvicorn.run(
-        "app.main:app",
+        "app.main:create_app",
+        factory=True,
         host="0.0.0.0",
         port=settings.port,
         reload=settings.debug,
         log_level="info" if not settings.debug else "debug",
-    ) 
\ No newline at end of file
+    )
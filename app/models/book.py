@@ -5,7 +5,7 @@ This module defines the Book database model with all required fields
 that correspond to the Pydantic schemas.
 """
 
-from sqlalchemy import Column, String, Text
+from sqlalchemy import DDL, Column, Index, Integer, String, Text, event, text
 from app.models.base import BaseModel
 
 
@@ -18,6 +18,7 @@ class Book(BaseModel):
     - author: Book author (required, max 255 chars)  
     - source_url: URL where book can be found (required, max 500 chars)
     - curation_status: Status of curation process (default: "pending")
+    - version: Row version, incremented by every write (entity ETags are built from it)
     
     Inherits from BaseModel:
     - id: Primary key
@@ -28,6 +29,40 @@ class Book(BaseModel):
     
     __tablename__ = "books"
     
+    __table_args__ = (
+        # Trigram GIN indexes let PostgreSQL answer `ILIKE '%term%'` searches
+        # without a sequential scan (the B-tree indexes below cannot).
+        Index(
+            "ix_books_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_books_author_trgm",
+            "author",
+            postgresql_using="gin",
+            postgresql_ops={"author": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Partial (active rows only) composite indexes matching the list,
+        # export, count and bulk queries: filter on is_active, then page in
+        # (sort key, id) order. Built concurrently by migration 0003.
+        *(
+            Index(
+                name,
+                *columns,
+                postgresql_where=text("is_active IS true"),
+                sqlite_where=text("is_active IS 1"),
+            )
+            for name, columns in (
+                ("ix_books_active_id", ("id",)),
+                ("ix_books_active_status_id", ("curation_status", "id")),
+                ("ix_books_active_title_id", ("title", "id")),
+                ("ix_books_active_author_id", ("author", "id")),
+            )
+        ),
+    )
+    
     # Book specific fields
     title = Column(
         String(255),
@@ -57,8 +92,62 @@ class Book(BaseModel):
         comment="Status of the book curation process"
     )
     
+    # Incremented in the same statement as every write. Entity ETags are
+    # built from it rather than from `updated_at`, whose precision (one
+    # second on SQLite) lets two quick writes share a timestamp.
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default=text("1"),
+        comment="Row version, incremented on every update"
+    )
+    
     def __repr__(self):
         """
         String representation for debugging
         """
-        return f"<Book(id={self.id}, title='{self.title}', author='{self.author}', status='{self.curation_status}')>" 
\ No newline at end of file
+        return f"<Book(id={self.id}, title='{self.title}', author='{self.author}', status='{self.curation_status}')>" 
+
+# Search support DDL (see app.core.search)
+# PostgreSQL needs the pg_trgm extension before the trigram indexes are built.
+event.listen(
+    Book.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# SQLite mirrors title/author into an external-content FTS5 table kept in
+# sync by triggers. The trigram tokenizer preserves substring matching.
+for statement in (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, content='books', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author)
+        VALUES ('delete', old.id, old.title, old.author);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF title, author ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author)
+        VALUES ('delete', old.id, old.title, old.author);
+        INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END
+    """,
+):
+    event.listen(Book.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    Book.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS books_fts").execute_if(dialect="sqlite"),
+)
@@ -6,4 +6,4 @@ Schemas package for API request/response validation
 # Contains data validation and serialization schemas for API requests/responses 
 
 # Import book schemas
-from .book import Book, BookCreate 
\ No newline at end of file
+from .book import Book, BookBulkResult, BookCreate 
\ No newline at end of file
@@ -53,17 +53,27 @@ class PaginatedResponse(BaseModel, Generic[T]):
     
     items: List[T]
     total: int
-    page: int
+    page: Optional[int]  # None when paging with a cursor
     size: int
     pages: int
+    count_strategy: Optional[str] = None  # How `total` was produced, if not exact
+    next_cursor: Optional[str] = None  # Cursor for the next page, if any
+    
+    @staticmethod
+    def page_count(total: int, size: int) -> int:
+        """
+        Number of pages needed for `total` items at `size` items per page
+        """
+        return (total + size - 1) // size  # Ceiling division
     
     @classmethod
     def create(
         cls,
         items: List[T],
         total: int,
-        page: int,
-        size: int
+        page: Optional[int],
+        size: int,
+        **extra: Any
     ) -> "PaginatedResponse[T]":
         """
         Create a paginated response with calculated pages
@@ -71,20 +81,20 @@ class PaginatedResponse(BaseModel, Generic[T]):
         Args:
             items: List of items for current page
             total: Total number of items across all pages
-            page: Current page number (1-based)
+            page: Current page number (1-based), or None in cursor mode
             size: Number of items per page
+            **extra: Optional fields such as `count_strategy` and `next_cursor`
             
         Returns:
             PaginatedResponse instance with calculated pages
         """
-        pages = (total + size - 1) // size  # Ceiling division
-        
         return cls(
             items=items,
             total=total,
             page=page,
             size=size,
-            pages=pages
+            pages=cls.page_count(total, size),
+            **extra
         )
 
 
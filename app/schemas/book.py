@@ -6,7 +6,7 @@ including schemas for creation requests and API responses.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, Field
 
 
@@ -139,4 +139,127 @@ class Book(BookCreate):
         from_attributes=True,  # Critical: allows reading from SQLAlchemy ORM objects
         validate_assignment=True,
         use_enum_values=True
-    ) 
\ No newline at end of file
+    ) 
+
+class BookBulkItemResult(BaseModel):
+    """
+    Outcome of one item in a bulk create request
+    
+    Fields:
+        index: Position of the item in the request array
+        success: Whether the book was created
+        book: The created book (on success)
+        error: Why the item was rejected (on failure)
+    """
+    
+    index: int = Field(description="Position of the item in the request array", examples=[0])
+    success: bool = Field(description="Whether the book was created", examples=[True])
+    book: Optional[Book] = Field(None, description="The created book, if successful")
+    error: Optional[str] = Field(None, description="Reason the item was rejected, if it failed")
+
+
+class BookBulkResult(BaseModel):
+    """
+    Schema for bulk create responses
+    
+    Summarizes a bulk create request and reports each item individually,
+    so a few invalid items do not reject the whole batch.
+    
+    Fields:
+        total: Number of items received
+        succeeded: Number of books created
+        failed: Number of items rejected
+        items: Per-item outcomes in request order
+    """
+    
+    total: int = Field(description="Number of items received", examples=[2])
+    succeeded: int = Field(description="Number of books created", examples=[1])
+    failed: int = Field(description="Number of items rejected", examples=[1])
+    items: List[BookBulkItemResult]
+
+
+class BookImportRejection(BaseModel):
+    """
+    A row rejected during an import
+    
+    Fields:
+        line: Line number in the uploaded file where the row starts
+        error: Why the row was rejected
+    """
+    
+    line: int = Field(description="Line number where the rejected row starts", examples=[42])
+    error: str = Field(description="Reason the row was rejected", examples=["title: Field required"])
+
+
+class BookImportResult(BaseModel):
+    """
+    Schema for import responses
+    
+    Fields:
+        accepted: Number of books created
+        rejected: Number of rows rejected
+        rejected_rows: Line numbers and reasons for rejected rows (capped)
+        truncated: Whether rejected_rows was capped
+    """
+    
+    accepted: int = Field(description="Number of books created", examples=[9998])
+    rejected: int = Field(description="Number of rows rejected", examples=[2])
+    rejected_rows: List[BookImportRejection] = Field(
+        description="Rejected rows in file order, capped at IMPORT_MAX_REPORTED_REJECTIONS"
+    )
+    truncated: bool = Field(description="Whether more rows were rejected than are listed", examples=[False])
+
+
+class BookBulkSelection(BaseModel):
+    """
+    Books targeted by a bulk change
+    
+    Either list the ids, or leave `ids` out and select books with the
+    list filters (`curation_status`, `search`, `is_active` query parameters).
+    
+    Fields:
+        ids: Ids of the books to change (optional)
+        return_ids: Whether the response lists the ids of the changed books
+    """
+    
+    ids: Optional[List[int]] = Field(
+        None,
+        description="Ids of the books to change; omit to select by the query filters",
+        examples=[[1, 2, 3]]
+    )
+    return_ids: bool = Field(False, description="List the ids of the changed books in the response")
+
+
+class BookBulkStatusUpdate(BookBulkSelection):
+    """
+    Schema for bulk curation status changes
+    
+    Fields:
+        curation_status: Status to set on every selected book
+    """
+    
+    curation_status: str = Field(
+        min_length=1,
+        max_length=50,
+        description="Status to set on every selected book",
+        examples=["approved"]
+    )
+    
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+class BookBulkChangeResult(BaseModel):
+    """
+    Schema for bulk status change and bulk delete responses
+    
+    Fields:
+        affected: Number of books changed
+        chunks: Number of UPDATE statements (and transactions) used
+        ids: Ids of the changed books, when requested (capped)
+        truncated: Whether more books changed than `ids` lists
+    """
+    
+    affected: int = Field(description="Number of books changed", examples=[250])
+    chunks: int = Field(description="Number of UPDATE statements (and transactions) used", examples=[1])
+    ids: Optional[List[int]] = Field(None, description="Ids of the changed books, capped at BULK_MAX_ITEMS")
+    truncated: bool = Field(False, description="Whether more books changed than are listed", examples=[False])
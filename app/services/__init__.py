@@ -0,0 +1,2 @@
+# Services package
+# Contains database workflows shared by API endpoints and command-line tools
@@ -0,0 +1,250 @@
+"""
+Streaming book import for NDJSON and CSV files
+
+This module parses uploaded catalog files incrementally, validates each
+row against `BookCreate` and writes accepted rows in bounded batches.
+Only one batch and one partial line or record are held in memory at a
+time, and lines and records are capped at `max_record_bytes` (longer ones
+are rejected), so peak memory does not depend on the size of the file.
+
+It is used by the `POST /books/import` endpoint and the
+`python -m app.cli.import_books` command.
+"""
+
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.book import BookCreate
+from app.services.books import copy_books, format_validation_error, insert_books_batched
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+# (line number, parsed row or None, parse error or None)
+ParsedRecord = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+@dataclass
+class ImportSummary:
+    """
+    Outcome of an import
+
+    Attributes:
+        max_reported: Maximum number of entries kept in `rejected_rows`
+        accepted: Number of rows written to the database
+        rejected: Number of rows that failed parsing, validation or insert
+        rejected_rows: (line number, reason) for the first rejected rows
+        truncated: Whether more rows were rejected than `rejected_rows` holds
+    """
+
+    max_reported: int
+    accepted: int = 0
+    rejected: int = 0
+    rejected_rows: List[Tuple[int, str]] = field(default_factory=list)
+    truncated: bool = False
+
+    def reject(self, line: int, reason: str) -> None:
+        self.rejected += 1
+        if len(self.rejected_rows) < self.max_reported:
+            self.rejected_rows.append((line, reason))
+        else:
+            self.truncated = True
+
+
+# Default cap on the length of one line or CSV record
+DEFAULT_MAX_RECORD_BYTES = 1024 * 1024
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+    max_length: int = DEFAULT_MAX_RECORD_BYTES,
+) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    """
+    Split a stream of UTF-8 byte chunks into numbered lines
+
+    Args:
+        chunks: Raw file content in arbitrarily sized chunks
+        max_length: Longest line kept, in characters; the rest of a longer
+            line is discarded as it arrives
+
+    Yields:
+        Tuple[int, Optional[str]]: 1-based line number and line text
+        without its terminator, or None for a line over `max_length`
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    overlong = False
+    line_number = 0
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, None if overlong or len(line) > max_length else line.rstrip("\r")
+            overlong = False
+        if len(pending) > max_length:
+            overlong, pending = True, ""
+
+    pending += decoder.decode(b"", final=True)
+    if overlong or len(pending) > max_length:
+        yield line_number + 1, None
+    elif pending:
+        yield line_number + 1, pending.rstrip("\r")
+
+
+async def parse_ndjson(
+    chunks: AsyncIterable[bytes],
+    max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES,
+) -> AsyncIterator[ParsedRecord]:
+    """
+    Parse newline-delimited JSON objects, skipping blank lines
+    """
+    async for line_number, line in iter_lines(chunks, max_record_bytes):
+        if line is None:
+            yield line_number, None, _too_long(max_record_bytes)
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, row, None
+
+
+async def parse_csv(
+    chunks: AsyncIterable[bytes],
+    max_record_bytes: int = DEFAULT_MAX_RECORD_BYTES,
+) -> AsyncIterator[ParsedRecord]:
+    """
+    Parse CSV records keyed by the header row, skipping blank lines
+
+    Quoted fields may span several lines; a record is complete once it
+    contains an even number of quote characters. The reported line number
+    is the line on which the record starts. A record growing past
+    `max_record_bytes` (e.g. after an unbalanced quote) is rejected and
+    parsing resumes on the next line.
+    """
+    header: Optional[List[str]] = None
+    record = ""
+    record_line = 0
+
+    async for line_number, line in iter_lines(chunks, max_record_bytes):
+        if line is None:
+            yield (record_line if record else line_number), None, _too_long(max_record_bytes)
+            record = ""
+            continue
+        if not record:
+            if not line.strip():
+                continue
+            record, record_line = line, line_number
+        else:
+            record += "\n" + line
+
+        if len(record) > max_record_bytes:
+            yield record_line, None, _too_long(max_record_bytes)
+            record = ""
+            continue
+
+        if record.count('"') % 2:
+            continue  # Inside a quoted field that continues on the next line
+
+        values = next(csv.reader([record]))
+        record = ""
+
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield record_line, None, f"Expected {len(header)} fields, found {len(values)}"
+            continue
+        yield record_line, dict(zip(header, values)), None
+
+    if record:
+        yield record_line, None, "Unterminated quoted field"
+
+
+def _too_long(max_record_bytes: int) -> str:
+    return f"Record exceeds {max_record_bytes} characters"
+
+
+async def import_books(
+    db: AsyncSession,
+    records: AsyncIterable[ParsedRecord],
+    batch_size: int,
+    max_reported: int,
+) -> ImportSummary:
+    """
+    Validate parsed records and write the accepted ones in batches
+
+    Batches are written with `copy_books` (COPY FROM STDIN on PostgreSQL,
+    executemany elsewhere) and committed one at a time. If a batch is
+    rejected by the database, its rows are retried individually so only
+    the offending lines are reported.
+
+    Args:
+        db: Async database session
+        records: Output of `parse_ndjson` or `parse_csv`
+        batch_size: Maximum rows written per batch
+        max_reported: Maximum rejected rows listed in the summary
+
+    Returns:
+        ImportSummary: Accepted/rejected counts and rejected line numbers
+    """
+    summary = ImportSummary(max_reported=max_reported)
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    async for line_number, row, error in records:
+        if error is not None:
+            summary.reject(line_number, error)
+            continue
+        try:
+            book_in = BookCreate.model_validate(row)
+        except ValidationError as e:
+            summary.reject(line_number, format_validation_error(e))
+            continue
+
+        batch.append((line_number, book_in.model_dump()))
+        if len(batch) >= batch_size:
+            await _write_batch(db, batch, summary)
+            batch = []
+
+    if batch:
+        await _write_batch(db, batch, summary)
+
+    return summary
+
+
+async def _write_batch(
+    db: AsyncSession,
+    batch: List[Tuple[int, Dict[str, Any]]],
+    summary: ImportSummary,
+) -> None:
+    rows = [row for _, row in batch]
+    try:
+        await copy_books(db, rows)
+        await db.commit()
+    except Exception:
+        # COPY errors come straight from the driver, so their types vary
+        await db.rollback()
+    else:
+        summary.accepted += len(rows)
+        return
+
+    outcomes = await insert_books_batched(db, rows, chunk_size=1)
+    for (line_number, _), outcome in zip(batch, outcomes):
+        if outcome.error is None:
+            summary.accepted += 1
+        else:
+            summary.reject(line_number, outcome.error)
+
@@ -0,0 +1,262 @@
+"""
+Book write workflows shared by the API and command-line tools
+
+This module holds batched insert and set-based update logic that is too
+involved for a single endpoint handler and is reused by several entry points.
+"""
+
+import csv
+import io
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from pydantic import ValidationError
+from sqlalchemy import Select, func, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.book import Book as BookModel
+
+# Columns written by COPY; COPY bypasses the model's Python-side defaults,
+# so every NOT NULL column is listed and filled in explicitly.
+COPY_COLUMNS = (
+    "title",
+    "author",
+    "source_url",
+    "curation_status",
+    "is_active",
+    "created_at",
+    "updated_at",
+    "version",
+)
+
+
+@dataclass
+class InsertOutcome:
+    """
+    Result of inserting one row
+
+    Attributes:
+        book: The inserted book, or None if the insert failed
+        error: Database error message when the insert failed
+    """
+
+    book: Optional[BookModel] = None
+    error: Optional[str] = None
+
+
+async def insert_books_batched(
+    db: AsyncSession,
+    rows: Sequence[Dict[str, Any]],
+    chunk_size: int,
+) -> List[InsertOutcome]:
+    """
+    Insert validated book rows in chunks using multi-row INSERT ... RETURNING
+
+    Each chunk is sent as a single multi-row INSERT and committed on its own,
+    so a 10k-row batch costs a handful of round trips rather than one
+    transaction per row. If a chunk fails, its rows are retried one at a
+    time so only the offending rows are reported as failed.
+
+    Args:
+        db: Async database session
+        rows: Column values for each book, already validated
+        chunk_size: Maximum number of rows per INSERT statement
+
+    Returns:
+        List[InsertOutcome]: One outcome per input row, in input order
+    """
+    outcomes: List[InsertOutcome] = []
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = list(rows[start:start + chunk_size])
+        try:
+            books = await _insert_chunk(db, chunk)
+        except SQLAlchemyError:
+            await db.rollback()
+            outcomes.extend([await _insert_one(db, row) for row in chunk])
+        else:
+            outcomes.extend(InsertOutcome(book=book) for book in books)
+
+    return outcomes
+
+
+async def _insert_chunk(db: AsyncSession, chunk: List[Dict[str, Any]]) -> List[BookModel]:
+    # sort_by_parameter_order keeps RETURNING rows aligned with the input rows
+    result = await db.execute(
+        insert(BookModel).returning(BookModel, sort_by_parameter_order=True),
+        chunk,
+    )
+    books = list(result.scalars().all())
+    await db.commit()
+    return books
+
+
+async def _insert_one(db: AsyncSession, row: Dict[str, Any]) -> InsertOutcome:
+    try:
+        books = await _insert_chunk(db, [row])
+    except SQLAlchemyError as e:
+        await db.rollback()
+        return InsertOutcome(error=str(e.orig) if getattr(e, "orig", None) else str(e))
+    return InsertOutcome(book=books[0])
+
+
+async def copy_books(db: AsyncSession, rows: Sequence[Dict[str, Any]]) -> None:
+    """
+    Write validated book rows as fast as the database driver allows
+
+    Uses `COPY books FROM STDIN` on PostgreSQL (asyncpg or psycopg2) and a
+    plain executemany INSERT elsewhere. Nothing is returned, which is what
+    makes COPY possible; use `insert_books_batched` when the created rows
+    are needed. The caller commits.
+
+    Args:
+        db: Async database session
+        rows: Column values for each book, already validated
+    """
+    dialect = db.get_bind().dialect
+
+    if dialect.name != "postgresql" or dialect.driver not in ("asyncpg", "psycopg2"):
+        await db.execute(insert(BookModel), list(rows))
+        return
+
+    # Use the database clock, as the model defaults do
+    now = await db.scalar(select(func.localtimestamp()))
+    records = [
+        (
+            row["title"],
+            row["author"],
+            row["source_url"],
+            row.get("curation_status", "pending"),
+            True,
+            now,
+            now,
+            1,
+        )
+        for row in rows
+    ]
+
+    if dialect.driver == "asyncpg":
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            BookModel.__tablename__, records=records, columns=list(COPY_COLUMNS)
+        )
+    else:
+        await db.run_sync(_copy_psycopg2, records)
+
+
+def _copy_psycopg2(session, records: List[tuple]) -> None:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(records)
+    buffer.seek(0)
+
+    dbapi_connection = session.connection().connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {BookModel.__tablename__} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """
+    Flatten a Pydantic validation error into a short, readable message
+
+    Args:
+        error: Validation error raised for one item
+
+    Returns:
+        str: "field: message" pairs separated by semicolons
+    """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+@dataclass
+class BulkUpdateOutcome:
+    """
+    Result of a chunked set-based update
+
+    Attributes:
+        affected: Number of rows changed
+        chunks: Number of UPDATE statements (and transactions) used
+        ids: Ids of the changed rows, up to the requested cap
+        truncated: Whether more rows changed than `ids` holds
+    """
+
+    affected: int = 0
+    chunks: int = 0
+    ids: List[int] = field(default_factory=list)
+    truncated: bool = False
+
+
+async def update_books_chunked(
+    db: AsyncSession,
+    selection: Select,
+    values: Dict[str, Any],
+    chunk_size: int,
+    max_ids: int,
+    on_chunk: Optional[Callable[[List[int]], None]] = None,
+) -> BulkUpdateOutcome:
+    """
+    Apply the same change to every book selected by a query
+
+    Books are changed in id order, `chunk_size` rows per
+    `UPDATE ... WHERE id IN (SELECT id ... ORDER BY id LIMIT n) RETURNING id`
+    statement, and every chunk is committed on its own. Row locks are
+    therefore held for one chunk at a time, and a very large change never
+    runs as one long transaction. The selection should exclude rows that
+    already have the new values; otherwise they are rewritten too. Each
+    changed row's `version` is incremented, which changes its ETag.
+
+    Args:
+        db: Async database session
+        selection: SELECT of `Book.id` (filters and joins allowed) choosing
+            the books to change
+        values: Column values to set
+        chunk_size: Maximum rows changed per statement
+        max_ids: Maximum changed ids kept in the outcome
+        on_chunk: Called with the ids of each committed chunk (e.g. to
+            invalidate caches)
+
+    Returns:
+        BulkUpdateOutcome: Affected count, chunk count and changed ids
+    """
+    outcome = BulkUpdateOutcome()
+    last_id = None
+
+    while True:
+        chunk = selection
+        if last_id is not None:
+            chunk = chunk.where(BookModel.id > last_id)
+        # The subquery reads the table being updated, so keep its own FROM
+        chunk = chunk.order_by(BookModel.id).limit(chunk_size).correlate(None)
+
+        ids = (await db.scalars(
+            update(BookModel)
+            .where(BookModel.id.in_(chunk.scalar_subquery()))
+            .values(**values, version=BookModel.version + 1)
+            .returning(BookModel.id)
+            .execution_options(synchronize_session=False)
+        )).all()
+        await db.commit()
+
+        if not ids:
+            break
+
+        outcome.affected += len(ids)
+        outcome.chunks += 1
+        room = max_ids - len(outcome.ids)
+        outcome.ids.extend(sorted(ids)[:room])
+        outcome.truncated = outcome.truncated or len(ids) > room
+        if on_chunk is not None:
+            on_chunk(ids)
+
+        if len(ids) < chunk_size:
+            break
+        last_id = max(ids)
+
+    return outcome
@@ -0,0 +1,2 @@
+# Benchmarks package
+# Each module is runnable with `python -m benchmarks.<name>`
@@ -0,0 +1,102 @@
+"""
+Benchmark: book list serialization paths
+
+Compares the two ways a `GET /books` page can be turned into JSON:
+
+- model path: load ORM entities, validate each one into `BookSchema`
+  (what `response_model=List[BookSchema]` does), then JSON-encode
+- fast path: select the `BookSchema` columns as tuples and encode them
+  directly with `app.core.encoding.dumps` (what `get_books` does now)
+
+Runs against an in-memory SQLite database so only query materialization
+and serialization are measured.
+
+Usage:
+    python -m benchmarks.list_serialization
+    python -m benchmarks.list_serialization --rows 1000 --repeat 200
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.core.encoding import dumps
+from app.models.book import Book as BookModel
+from app.schemas.book import Book as BookSchema
+
+BOOK_FIELDS = tuple(BookSchema.model_fields)
+BOOK_LIST = TypeAdapter(List[BookSchema])
+
+
+def model_path(session: Session, rows: int) -> bytes:
+    books = session.execute(select(BookModel).limit(rows)).scalars().all()
+    validated = BOOK_LIST.validate_python(books, from_attributes=True)
+    content = BOOK_LIST.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(session: Session, rows: int) -> bytes:
+    columns = [getattr(BookModel, name) for name in BOOK_FIELDS]
+    result = session.execute(select(*columns).limit(rows)).all()
+    return dumps([dict(zip(BOOK_FIELDS, row)) for row in result])
+
+
+def measure(fn: Callable[[Session, int], bytes], session: Session, rows: int, repeat: int) -> float:
+    """
+    Return the best average seconds per call over three rounds
+    """
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(session, rows)
+            session.expunge_all()  # Do not let the identity map hide ORM costs
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare book list serialization paths")
+    parser.add_argument("--rows", type=int, default=1000, help="Books per page")
+    parser.add_argument("--repeat", type=int, default=100, help="Pages per measurement round")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.execute(
+            insert(BookModel),
+            [
+                {
+                    "title": f"Book {i}",
+                    "author": f"Author {i % 97}",
+                    "source_url": f"https://example.com/books/{i}",
+                }
+                for i in range(args.rows)
+            ],
+        )
+        session.commit()
+
+        assert json.loads(model_path(session, args.rows)) == json.loads(fast_path(session, args.rows))
+
+        model = measure(model_path, session, args.rows, args.repeat)
+        fast = measure(fast_path, session, args.rows, args.repeat)
+
+    print(json.dumps({
+        "rows": args.rows,
+        "model_path_ms": round(model * 1000, 3),
+        "fast_path_ms": round(fast * 1000, 3),
+        "speedup": round(model / fast, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
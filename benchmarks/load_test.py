@@ -0,0 +1,290 @@
+"""
+Benchmark: end-to-end load test of the books API
+
+Drives the real FastAPI app in-process (httpx `ASGITransport`, with the
+app's lifespan running) from concurrent simulated clients. Each client
+loops over a weighted mix of operations:
+
+- list:   GET  /books?curation_status=...&limit=20
+- search: GET  /books?search=<word>&limit=20
+- detail: GET  /books/{id}
+- create: POST /books
+- update: PATCH /books/{id}
+
+Every operation goes through routing, middleware, validation, the
+connection pool and the configured database (`DATABASE_URI`, local
+PostgreSQL or SQLite), so releases can be compared on the same machine.
+Only the network hop is left out. The report is JSON: requests, RPS,
+errors, status codes and p50/p95/p99 latency per operation and overall.
+
+Each client has its own cookie jar, so read-your-writes pinning only
+affects the client that wrote.
+
+Usage:
+    python -m benchmarks.load_test --seed-rows 10000 --create-tables
+    python -m benchmarks.load_test --concurrency 64 --duration 30 --output result.json
+    python -m benchmarks.load_test --mix list=70,detail=30
+
+Seed large tables once with `python -m benchmarks.seed_books` and reuse them.
+Requires httpx (`pip install httpx`).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import async_session_scope, create_tables
+from app.models.book import Book as BookModel
+from benchmarks.seed_books import STATUS_WEIGHTS, TITLE_WORDS, seed
+
+DEFAULT_MIX = "list=40,search=15,detail=35,create=5,update=5"
+
+BOOKS_PATH = f"{settings.api_v1_str}/books"
+
+
+class Workload:
+    """
+    What the simulated clients send: ids to read and values to write
+    """
+
+    def __init__(self, max_id: int):
+        self.max_id = max_id
+        self.statuses = list(STATUS_WEIGHTS)
+
+    def book_id(self, rng: random.Random) -> int:
+        return rng.randint(1, self.max_id)
+
+
+Operation = Callable[[httpx.AsyncClient, random.Random, Workload], Awaitable[httpx.Response]]
+
+
+async def list_books(client: httpx.AsyncClient, rng: random.Random, workload: Workload) -> httpx.Response:
+    return await client.get(
+        f"{BOOKS_PATH}/",
+        params={"curation_status": rng.choice(workload.statuses), "limit": 20},
+    )
+
+
+async def search_books(client: httpx.AsyncClient, rng: random.Random, workload: Workload) -> httpx.Response:
+    return await client.get(f"{BOOKS_PATH}/", params={"search": rng.choice(TITLE_WORDS), "limit": 20})
+
+
+async def get_book(client: httpx.AsyncClient, rng: random.Random, workload: Workload) -> httpx.Response:
+    return await client.get(f"{BOOKS_PATH}/{workload.book_id(rng)}")
+
+
+async def create_book(client: httpx.AsyncClient, rng: random.Random, workload: Workload) -> httpx.Response:
+    number = rng.getrandbits(32)
+    return await client.post(
+        f"{BOOKS_PATH}/",
+        json={
+            "title": f"Load Test {rng.choice(TITLE_WORDS).title()} {number}",
+            "author": "Load Test",
+            "source_url": f"https://books.example.com/load/{number}",
+        },
+    )
+
+
+async def update_book(client: httpx.AsyncClient, rng: random.Random, workload: Workload) -> httpx.Response:
+    return await client.patch(
+        f"{BOOKS_PATH}/{workload.book_id(rng)}",
+        json={"curation_status": rng.choice(workload.statuses)},
+    )
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "list": list_books,
+    "search": search_books,
+    "detail": get_book,
+    "create": create_book,
+    "update": update_book,
+}
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """
+    Parse "list=40,detail=60" into operation weights
+    """
+    mix: Dict[str, int] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name] = int(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("The mix needs at least one operation with a positive weight")
+    return mix
+
+
+class Recorder:
+    """
+    Latencies and status codes per operation
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+        self.statuses: Dict[str, Counter] = {name: Counter() for name in OPERATIONS}
+
+    def record(self, name: str, status: str, seconds: float) -> None:
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        endpoints = {
+            name: _summary(self.latencies[name], self.statuses[name], elapsed)
+            for name in OPERATIONS
+            if self.latencies[name]
+        }
+        everything = [seconds for latencies in self.latencies.values() for seconds in latencies]
+        statuses = sum(self.statuses.values(), Counter())
+        return {"total": _summary(everything, statuses, elapsed), "endpoints": endpoints}
+
+
+def _summary(latencies: List[float], statuses: Counter, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "rps": round(len(ordered) / elapsed, 1),
+        "errors": sum(count for status, count in statuses.items() if not status.startswith(("2", "3"))),
+        "status_codes": dict(sorted(statuses.items())),
+        "latency_ms": {
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "p99": _percentile(ordered, 99),
+            "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3),
+        },
+    }
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    # Nearest-rank percentile of sorted seconds, in milliseconds
+    rank = max(int(len(ordered) * percent / 100 + 0.999999) - 1, 0)
+    return round(ordered[min(rank, len(ordered) - 1)] * 1000, 3)
+
+
+async def run_client(
+    client: httpx.AsyncClient,
+    rng: random.Random,
+    workload: Workload,
+    mix: Dict[str, int],
+    deadline: float,
+    recorder: Recorder,
+) -> None:
+    """
+    Send requests from one simulated client until the deadline
+    """
+    names = list(mix)
+    weights = list(mix.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await OPERATIONS[name](client, rng, workload)
+            status = str(response.status_code)
+        except Exception as e:
+            status = type(e).__name__
+        recorder.record(name, status, time.perf_counter() - start)
+
+
+async def run_phase(
+    clients: List[httpx.AsyncClient],
+    workload: Workload,
+    mix: Dict[str, int],
+    seconds: float,
+    seed_value: int,
+) -> Dict[str, Any]:
+    """
+    Run every client concurrently for `seconds` and report the results
+    """
+    recorder = Recorder()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(client, random.Random(seed_value * 7919 + index), workload, mix, start + seconds, recorder)
+        for index, client in enumerate(clients)
+    ))
+    return recorder.report(time.perf_counter() - start)
+
+
+async def max_book_id() -> int:
+    async with async_session_scope() as db:
+        return await db.scalar(select(func.max(BookModel.id))) or 0
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.seed_rows:
+        seeding: Optional[Dict[str, Any]] = await seed(args.seed_rows, args.batch_size, reset=True)
+    else:
+        seeding = None
+
+    max_id = await max_book_id()
+    if not max_id:
+        raise SystemExit("The books table is empty; pass --seed-rows or run benchmarks.seed_books first")
+    workload = Workload(max_id)
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        clients = [
+            httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=args.timeout)
+            for _ in range(args.concurrency)
+        ]
+        try:
+            if args.warmup > 0:
+                await run_phase(clients, workload, args.mix, args.warmup, args.seed + 1)
+            results = await run_phase(clients, workload, args.mix, args.duration, args.seed)
+        finally:
+            await asyncio.gather(*(client.aclose() for client in clients))
+
+    return {
+        "config": {
+            "database": settings.database_url.split(":", 1)[0],
+            "database_async": settings.database_async,
+            "books": max_id,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "mix": args.mix,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+        },
+        "seeding": seeding,
+        **results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the books API in-process")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent simulated clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed-rows", type=int, default=0, help="Reset and seed this many books first")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Books per seeding batch")
+    parser.add_argument("--create-tables", action="store_true", help="Create missing tables first")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the request sequence")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.create_tables:
+        create_tables()
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
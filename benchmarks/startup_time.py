@@ -0,0 +1,122 @@
+"""
+Benchmark: import-to-first-request time
+
+Measures how long a fresh process takes from importing the application
+to answering its first request, the cold-start cost paid by every
+autoscaled replica and test worker. Each run is a new interpreter that
+reports three phases:
+
+- import_ms: `from app.main import create_app`
+- create_app_ms: building the app (deferred imports, routers, middleware)
+- first_request_ms: lifespan startup plus the first request, including
+  engine creation and the first database connection
+
+The first request goes through httpx `ASGITransport` to the configured
+database (`DATABASE_URI`). With `--budget-ms` the command fails when the
+median import-to-first-request time exceeds the budget, so CI can track it.
+
+Usage:
+    python -m benchmarks.startup_time
+    python -m benchmarks.startup_time --runs 10 --profile production --budget-ms 1500
+    python -m benchmarks.startup_time --path /health
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+# Runs in the child interpreter; prints one JSON line of phase timings
+CHILD_SCRIPT = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from app.main import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+
+async def first_request():
+    import httpx
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            response = await client.get(sys.argv[1])
+    return response.status_code
+
+status = asyncio.run(first_request())
+answered = time.perf_counter()
+print(json.dumps({
+    "status": status,
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (answered - created) * 1000,
+    "import_to_first_request_ms": (answered - start) * 1000,
+}))
+"""
+
+PHASES = ("import_ms", "create_app_ms", "first_request_ms", "import_to_first_request_ms", "process_ms")
+
+
+def measure_once(path: str, environment: Dict[str, str]) -> Dict[str, float]:
+    """
+    Start a fresh interpreter, serve one request and return its timings
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, path],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    process_ms = (time.perf_counter() - start) * 1000
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["process_ms"] = process_ms
+    return timings
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        phase: {
+            "median": round(statistics.median(run[phase] for run in runs), 1),
+            "min": round(min(run[phase] for run in runs), 1),
+            "max": round(max(run[phase] for run in runs), 1),
+        }
+        for phase in PHASES
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure import-to-first-request time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes to measure")
+    parser.add_argument("--path", default="/api/v1/books/?limit=1", help="Path of the first request")
+    parser.add_argument("--profile", choices=("development", "production"), help="Set ENVIRONMENT for the runs")
+    parser.add_argument("--budget-ms", type=float, help="Fail when the median import-to-first-request time is higher")
+    args = parser.parse_args()
+
+    environment = dict(os.environ)
+    if args.profile:
+        environment["ENVIRONMENT"] = args.profile
+
+    runs = [measure_once(args.path, environment) for _ in range(args.runs)]
+    summary = summarize(runs)
+    median = summary["import_to_first_request_ms"]["median"]
+    report = {
+        "path": args.path,
+        "runs": args.runs,
+        "profile": environment.get("ENVIRONMENT", "development"),
+        "status_codes": sorted({run["status"] for run in runs}),
+        "timings_ms": summary,
+        "budget_ms": args.budget_ms,
+        "within_budget": None if args.budget_ms is None else median <= args.budget_ms,
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if report["within_budget"] is False else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Alembic migration environment for Reactive Hub API
+
+Connects with the application's settings (`settings.database_url`) and
+compares against the SQLAlchemy models' metadata for autogenerate.
+
+Migrations that build indexes CONCURRENTLY on PostgreSQL run those
+statements inside `op.get_context().autocommit_block()`, because
+CONCURRENTLY cannot run in a transaction.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401  Register the models on Base.metadata
+
+config = context.config
+
+# Set up loggers from alembic.ini
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Objects created by migrations but not modelled: the SQLite FTS5 search
+# table (migration 0002) and the shadow tables FTS5 keeps for it
+UNMODELLED_TABLE_PREFIXES = ("books_fts",)
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """
+    Keep autogenerate from proposing to drop or add objects that only
+    exist on some databases
+    """
+    if type_ == "table" and reflected and compare_to is None:
+        return not name.startswith(UNMODELLED_TABLE_PREFIXES)
+    if type_ == "index" and not reflected:
+        # Indexes declared with `.ddl_if(dialect=...)`, e.g. the trigram ones
+        ddl_if = getattr(obj, "_ddl_if", None)
+        dialect = context.get_context().dialect.name
+        if ddl_if is not None and ddl_if.dialect not in (None, dialect):
+            return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """
+    Emit the migration SQL without connecting to a database
+    """
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """
+    Run migrations against the configured database
+    """
+    # A throwaway engine: migrations need no pool or request instrumentation
+    connectable = create_engine(settings.database_url, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,52 @@
+"""Initial schema: books table
+
+Matches the tables previously created by `create_tables()`. Databases
+created that way can adopt migrations with `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "books",
+        sa.Column("title", sa.String(length=255), nullable=False, comment="Book title"),
+        sa.Column("author", sa.String(length=255), nullable=False, comment="Book author"),
+        sa.Column("source_url", sa.String(length=500), nullable=False, comment="URL where the book can be found"),
+        sa.Column("curation_status", sa.String(length=50), nullable=False, comment="Status of the book curation process"),
+        sa.Column("id", sa.Integer(), nullable=False, comment="Primary key identifier"),
+        sa.Column("created_at", sa.DateTime(), nullable=False, comment="Record creation timestamp"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, comment="Record last update timestamp"),
+        sa.Column("is_active", sa.Boolean(), nullable=False, comment="Soft delete flag - True: active, False: deleted"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_books_id", "books", ["id"])
+    op.create_index("ix_books_title", "books", ["title"])
+    op.create_index("ix_books_author", "books", ["author"])
+    op.create_index("ix_books_curation_status", "books", ["curation_status"])
+    op.create_index("ix_books_is_active", "books", ["is_active"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_books_is_active", table_name="books")
+    op.drop_index("ix_books_curation_status", table_name="books")
+    op.drop_index("ix_books_author", table_name="books")
+    op.drop_index("ix_books_title", table_name="books")
+    op.drop_index("ix_books_id", table_name="books")
+    op.drop_table("books")
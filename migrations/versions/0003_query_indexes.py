@@ -0,0 +1,67 @@
+"""Composite partial indexes for the book endpoints' query shapes
+
+Every list, detail, export, count and bulk query reads active books
+only (`is_active IS true`) and pages in `(sort key, id)` order with
+keyset conditions. Partial indexes over active rows serve those queries
+in index order, so the database does not have to scan and sort:
+
+- ix_books_active_id: default listing and export (ORDER BY id), active
+  row counts
+- ix_books_active_status_id: `curation_status=` filter with ORDER BY id,
+  `order_by=curation_status`, bulk status changes
+- ix_books_active_title_id / ix_books_active_author_id:
+  `order_by=title` / `order_by=author` keyset pages
+
+The predicate is written exactly as the queries write it (`IS true`,
+`IS 1` on SQLite) so both planners can prove the index applies.
+
+On PostgreSQL the indexes are built CONCURRENTLY, outside a transaction,
+so they can be applied online without blocking writes. If a concurrent
+build fails it leaves an INVALID index behind; drop it and run the
+upgrade again.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:00:02.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, columns)
+ACTIVE_INDEXES = (
+    ("ix_books_active_id", ["id"]),
+    ("ix_books_active_status_id", ["curation_status", "id"]),
+    ("ix_books_active_title_id", ["title", "id"]),
+    ("ix_books_active_author_id", ["author", "id"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in ACTIVE_INDEXES:
+            op.create_index(
+                name,
+                "books",
+                columns,
+                postgresql_where=sa.text("is_active IS true"),
+                postgresql_concurrently=True,
+                sqlite_where=sa.text("is_active IS 1"),
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(ACTIVE_INDEXES):
+            op.drop_index(name, table_name="books", postgresql_concurrently=True)
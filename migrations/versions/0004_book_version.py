@@ -0,0 +1,42 @@
+"""Row version column for books
+
+Entity ETags (and so If-Match on writes) are built from `books.version`,
+which every write increments in the same statement. Existing rows start
+at version 1.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:00:03.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "books",
+        sa.Column(
+            "version",
+            sa.Integer(),
+            nullable=False,
+            server_default=sa.text("1"),
+            comment="Row version, incremented on every update",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("books") as batch_op:
+        batch_op.drop_column("version")
@@ -0,0 +1,52 @@
+"""
+Shared pytest configuration
+
+Async tests are marked with `pytest.mark.anyio` and run on asyncio
+(anyio ships with FastAPI and provides the pytest plugin). API tests use
+the `api` fixture: the whole app on a fresh SQLite database per test.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def api(tmp_path):
+    """
+    A TestClient for an app running on a fresh SQLite database
+    """
+    from fastapi.testclient import TestClient
+
+    from app.core import database
+    from app.core.config import Settings
+    from app.main import create_app
+
+    app = create_app(Settings(
+        _env_file=None,
+        database_uri=f"sqlite:///{tmp_path / 'books.db'}",
+        debug=False,
+    ))
+    database.create_tables()
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def create_book(api):
+    """
+    Create a book through the API and return its JSON representation
+    """
+
+    def create(title: str = "Title", author: str = "Author", **fields):
+        response = api.post(
+            "/api/v1/books/",
+            json={"title": title, "author": author, "source_url": "https://example.com", **fields},
+        )
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return create
@@ -0,0 +1,166 @@
+"""
+Tests for app.core.admission
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.admission import AdmissionControlMiddleware, AdmissionLimiter, HEALTH, READS, WRITES
+
+pytestmark = pytest.mark.anyio
+
+
+def new_limiter(limit: int = 1, queue_size: int = 1, queue_timeout_seconds: float = 1.0, adaptive: bool = False):
+    return AdmissionLimiter(
+        name=READS,
+        initial_limit=limit,
+        min_limit=1,
+        max_limit=8,
+        target_latency_seconds=1.0,
+        queue_size=queue_size,
+        queue_timeout_seconds=queue_timeout_seconds,
+        adaptive=adaptive,
+    )
+
+
+async def test_queued_request_gets_the_released_slot():
+    limiter = new_limiter()
+    assert await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.stats()["queue_length"] == 1
+
+    limiter.release(0.0)
+    assert await waiter
+    assert limiter.in_flight == 1
+    limiter.release(0.0)
+    assert limiter.in_flight == 0
+
+
+async def test_full_queue_sheds_and_in_flight_returns_to_zero():
+    limiter = new_limiter(queue_size=1)
+    assert await limiter.acquire()
+    queued = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    assert not await limiter.acquire()
+    assert limiter.stats()["shed_queue_full"] == 1
+
+    limiter.release(0.0)
+    assert await queued
+    limiter.release(0.0)
+    assert limiter.in_flight == 0
+    assert limiter.stats()["queue_length"] == 0
+
+
+async def test_wait_timeout_sheds_and_in_flight_returns_to_zero():
+    limiter = new_limiter(queue_timeout_seconds=0.01)
+    assert await limiter.acquire()
+
+    assert not await limiter.acquire()
+    assert limiter.stats()["shed_timeout"] == 1
+    assert limiter.stats()["queue_length"] == 0
+
+    limiter.release(0.0)
+    assert limiter.in_flight == 0
+
+
+async def test_slot_handed_over_as_the_wait_times_out_is_not_leaked(monkeypatch):
+    limiter = new_limiter()
+    assert await limiter.acquire()
+
+    async def timeout_after_handover(waiter, timeout):
+        limiter.release(0.0)  # Hands the slot to the waiter...
+        raise asyncio.TimeoutError  # ...just as its wait times out
+
+    monkeypatch.setattr(asyncio, "wait_for", timeout_after_handover)
+    assert await limiter.acquire()
+    monkeypatch.undo()
+
+    assert limiter.in_flight == 1
+    limiter.release(0.0)
+    assert limiter.in_flight == 0
+
+
+async def test_cancelled_waiter_does_not_keep_a_handed_over_slot():
+    limiter = new_limiter()
+    assert await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.release(0.0)  # Slot handed to the waiter
+    waiter.cancel()
+    # Depending on the Python version the waiter is either admitted with
+    # the slot or cancelled; either way the slot must not be lost
+    try:
+        admitted = await waiter
+    except asyncio.CancelledError:
+        admitted = False
+    if admitted:
+        limiter.release(0.0)
+    assert limiter.in_flight == 0
+
+
+async def test_slow_responses_shrink_the_limit_and_fast_saturated_ones_grow_it():
+    limiter = new_limiter(limit=4, adaptive=True)
+    for _ in range(4):
+        assert await limiter.acquire()
+
+    limiter.release(latency_seconds=2.0)
+    shrunk = limiter.limit
+    assert shrunk < 4
+
+    limiter.release(latency_seconds=0.0)  # Still saturated: 3 in flight, limit 3.6
+    assert limiter.limit > shrunk
+
+
+def build_app(limiters, release: asyncio.Event):
+    async def slow(request):
+        await release.wait()
+        return PlainTextResponse("ok")
+
+    async def health(request):
+        return PlainTextResponse("healthy")
+
+    app = Starlette(routes=[
+        Route("/books", slow, methods=["GET", "POST"]),
+        Route("/health", health),
+    ])
+    return AdmissionControlMiddleware(
+        app, health_paths=["/health"], limiters=limiters, shed_status=503, retry_after_seconds=2
+    )
+
+
+def middleware_limiters():
+    return {
+        READS: new_limiter(queue_size=0),
+        WRITES: new_limiter(queue_size=0),
+        HEALTH: new_limiter(queue_size=0),
+    }
+
+
+async def test_middleware_sheds_with_retry_after_while_health_and_preflights_pass():
+    limiters = middleware_limiters()
+    release = asyncio.Event()
+    app = build_app(limiters, release)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        busy = asyncio.ensure_future(http.get("/books"))
+        while limiters[READS].in_flight == 0:
+            await asyncio.sleep(0)
+
+        shed = await http.get("/books")
+        health = await http.get("/health")
+        preflight = await http.options("/books")
+        release.set()
+        await busy
+
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "2"
+    assert health.status_code == 200
+    assert preflight.status_code != 503
+    assert all(limiter.in_flight == 0 for limiter in limiters.values())
@@ -0,0 +1,65 @@
+"""
+Tests for the streaming parsers in app.services.book_import
+"""
+
+import pytest
+
+from app.services.book_import import parse_csv, parse_ndjson
+
+pytestmark = pytest.mark.anyio
+
+
+async def chunked(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(parser, data: bytes, **kwargs):
+    return [record async for record in parser(chunked(data), **kwargs)]
+
+
+async def test_csv_quoted_field_spans_lines():
+    data = b'title,author\n"Two\nlines",Someone\nPlain,Other\n'
+
+    records = await collect(parse_csv, data)
+
+    assert records == [
+        (2, {"title": "Two\nlines", "author": "Someone"}, None),
+        (4, {"title": "Plain", "author": "Other"}, None),
+    ]
+
+
+async def test_csv_unbalanced_quote_is_rejected_and_parsing_resumes():
+    rows = b"".join(b"Book %d,Author\n" % n for n in range(10))
+    data = b'title,author\n"Broken,Author\n' + rows + b"After,Author\n"
+
+    records = await collect(parse_csv, data, max_record_bytes=64)
+
+    line, row, error = records[0]
+    assert (line, row) == (2, None)
+    assert error == "Record exceeds 64 characters"
+    # Lines swallowed by the broken record are lost, later ones parse again
+    assert records[-1] == (13, {"title": "After", "author": "Author"}, None)
+    assert all(error is None for _, _, error in records[1:])
+
+
+async def test_ndjson_overlong_line_is_rejected():
+    data = b'{"title": "' + b"x" * 200 + b'"}\n{"title": "Short"}\n'
+
+    records = await collect(parse_ndjson, data, max_record_bytes=64)
+
+    assert records == [
+        (1, None, "Record exceeds 64 characters"),
+        (2, {"title": "Short"}, None),
+    ]
+
+
+async def test_overlong_last_line_without_newline_is_rejected():
+    data = b'{"title": "Short"}\n' + b"x" * 200
+
+    records = await collect(parse_ndjson, data, max_record_bytes=64)
+
+    assert records == [
+        (1, {"title": "Short"}, None),
+        (2, None, "Record exceeds 64 characters"),
+    ]
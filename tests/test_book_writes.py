@@ -0,0 +1,109 @@
+"""
+Tests for single-statement book writes: PUT, PATCH and DELETE with If-Match
+"""
+
+import pytest
+
+BOOKS = "/api/v1/books/"
+
+
+@pytest.mark.parametrize("method", ["put", "patch"])
+def test_update_bumps_the_version_and_returns_the_new_etag(api, create_book, method):
+    book = create_book()
+
+    first = getattr(api, method)(f"{BOOKS}{book['id']}", json={"title": "Once"})
+    second = getattr(api, method)(f"{BOOKS}{book['id']}", json={"title": "Twice"})
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["ETag"] == f'"{book["id"]}-v2"'
+    # Two writes in the same clock tick still get different ETags
+    assert second.headers["ETag"] == f'"{book["id"]}-v3"'
+    assert second.json()["title"] == "Twice"
+    assert api.get(f"{BOOKS}{book['id']}").headers["ETag"] == second.headers["ETag"]
+
+
+def test_patch_changes_only_the_given_fields(api, create_book):
+    book = create_book(title="Title", author="Author")
+
+    response = api.patch(f"{BOOKS}{book['id']}", json={"author": "Someone"})
+
+    assert response.json()["title"] == "Title"
+    assert response.json()["author"] == "Someone"
+
+
+def test_empty_patch_keeps_the_version(api, create_book):
+    book = create_book()
+
+    response = api.patch(f"{BOOKS}{book['id']}", json={})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{book["id"]}-v1"'
+
+
+def test_update_with_current_etag_succeeds(api, create_book):
+    book = create_book()
+    etag = api.get(f"{BOOKS}{book['id']}").headers["ETag"]
+
+    response = api.patch(f"{BOOKS}{book['id']}", json={"title": "New"}, headers={"If-Match": etag})
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("if_match", [
+    "stale",
+    "weak",
+    "sparse",
+    "other-book",
+    '"garbage"',
+])
+def test_update_with_non_matching_etag_is_rejected(api, create_book, if_match):
+    book = create_book()
+    other = create_book()
+    stale = api.get(f"{BOOKS}{book['id']}").headers["ETag"]
+    api.patch(f"{BOOKS}{book['id']}", json={"title": "Changed"})
+    current = api.get(f"{BOOKS}{book['id']}").headers["ETag"]
+    tags = {
+        "stale": stale,
+        # If-Match uses strong comparison
+        "weak": f"W/{current}",
+        "sparse": api.get(f"{BOOKS}{book['id']}", params={"fields": "id"}).headers["ETag"],
+        "other-book": api.get(f"{BOOKS}{other['id']}").headers["ETag"],
+    }
+
+    response = api.patch(
+        f"{BOOKS}{book['id']}",
+        json={"title": "Lost update"},
+        headers={"If-Match": tags.get(if_match, if_match)},
+    )
+
+    assert response.status_code == 412
+    assert api.get(f"{BOOKS}{book['id']}").json()["title"] == "Changed"
+
+
+def test_if_match_lists_and_star(api, create_book):
+    book = create_book()
+    etag = api.get(f"{BOOKS}{book['id']}").headers["ETag"]
+
+    listed = api.put(f"{BOOKS}{book['id']}", json={"title": "A"}, headers={"If-Match": f'"old", {etag}'})
+    star = api.put(f"{BOOKS}{book['id']}", json={"title": "B"}, headers={"If-Match": "*"})
+
+    assert listed.status_code == star.status_code == 200
+
+
+def test_delete_honors_if_match(api, create_book):
+    book = create_book()
+    etag = api.get(f"{BOOKS}{book['id']}").headers["ETag"]
+    api.patch(f"{BOOKS}{book['id']}", json={"title": "Changed"})
+
+    stale = api.delete(f"{BOOKS}{book['id']}", headers={"If-Match": etag})
+    current = api.delete(f"{BOOKS}{book['id']}", headers={"If-Match": f'"{book["id"]}-v2"'})
+
+    assert stale.status_code == 412
+    assert current.status_code == 204
+    assert api.get(f"{BOOKS}{book['id']}").status_code == 404
+
+
+def test_writes_to_a_missing_book_are_404_even_with_if_match(api):
+    assert api.patch(f"{BOOKS}999", json={"title": "x"}, headers={"If-Match": '"999-v1"'}).status_code == 404
+    assert api.put(f"{BOOKS}999", json={"title": "x"}).status_code == 404
+    assert api.delete(f"{BOOKS}999").status_code == 404
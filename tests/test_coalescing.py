@@ -0,0 +1,136 @@
+"""
+Tests for app.core.coalescing
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.coalescing import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+class Loader:
+    """
+    A load that blocks until released and counts how often it ran
+    """
+
+    def __init__(self, result="page", error: Exception = None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def start(flight: SingleFlight, key, load, count: int):
+    tasks = [asyncio.ensure_future(flight.run(key, load)) for _ in range(count)]
+    await asyncio.sleep(0)
+    return tasks
+
+
+async def test_identical_calls_share_one_load():
+    flight = SingleFlight("test")
+    load = Loader()
+    tasks = await start(flight, "k", load, 5)
+    load.release.set()
+
+    assert await asyncio.gather(*tasks) == ["page"] * 5
+    assert load.calls == 1
+    stats = flight.stats()
+    assert (stats["loads"], stats["shared"], stats["in_flight"]) == (1, 4, 0)
+
+
+async def test_different_keys_do_not_share():
+    flight = SingleFlight("test")
+    load = Loader()
+    tasks = [*await start(flight, "a", load, 2), *await start(flight, "b", load, 2)]
+    load.release.set()
+    await asyncio.gather(*tasks)
+
+    assert load.calls == 2
+
+
+async def test_leader_exception_reaches_every_follower():
+    flight = SingleFlight("test")
+    load = Loader(error=ValueError("bad sort field"))
+    tasks = await start(flight, "k", load, 3)
+    load.release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert load.calls == 1
+    assert flight.stats()["errors"] == 1
+    assert flight.stats()["in_flight"] == 0
+
+    # The failure is not cached: the next call loads again
+    retry = Loader(result="fresh")
+    retry.release.set()
+    assert await flight.run("k", retry) == "fresh"
+
+
+async def test_cancelled_leader_does_not_fail_followers_or_wedge_the_key():
+    flight = SingleFlight("test")
+    load = Loader()
+    leader, *followers = await start(flight, "k", load, 3)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    load.release.set()
+
+    assert await asyncio.gather(*followers) == ["page", "page"]
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    await asyncio.sleep(0)
+    assert flight.stats()["in_flight"] == 0
+
+    fresh = Loader(result="fresh")
+    fresh.release.set()
+    assert await flight.run("k", fresh) == "fresh"
+    assert fresh.calls == 1
+
+
+async def test_key_is_released_when_every_caller_is_cancelled():
+    flight = SingleFlight("test")
+    load = Loader()
+    tasks = await start(flight, "k", load, 2)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    load.release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert flight.stats()["in_flight"] == 0
+
+
+async def test_forget_makes_later_calls_load_afresh():
+    flight = SingleFlight("test")
+    before = Loader(result="before write")
+    early = await start(flight, "k", before, 1)
+
+    flight.forget()
+    after = Loader(result="after write")
+    late = await start(flight, "k", after, 1)
+
+    before.release.set()
+    after.release.set()
+    assert await asyncio.gather(*early, *late) == ["before write", "after write"]
+
+
+async def test_disabled_flight_runs_every_load():
+    flight = SingleFlight("test", enabled=False)
+    load = Loader()
+    tasks = await start(flight, "k", load, 3)
+    load.release.set()
+    await asyncio.gather(*tasks)
+
+    assert load.calls == 3
+    assert flight.stats()["shared"] == 0
@@ -0,0 +1,104 @@
+"""
+Tests for ETag / Last-Modified validators and 304 responses on book reads
+"""
+
+from datetime import datetime, timezone
+
+from app.core.conditional import http_date
+
+BOOKS = "/api/v1/books/"
+LONG_AGO = http_date(datetime(2000, 1, 1, tzinfo=timezone.utc))
+
+
+def test_book_etag_revalidates_with_304(api, create_book):
+    book = create_book()
+    first = api.get(f"{BOOKS}{book['id']}")
+
+    again = api.get(f"{BOOKS}{book['id']}", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert first.headers["ETag"] == f'"{book["id"]}-v1"'
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_weak_and_listed_etags_match_if_none_match(api, create_book):
+    book = create_book()
+    etag = api.get(f"{BOOKS}{book['id']}").headers["ETag"]
+
+    weak = api.get(f"{BOOKS}{book['id']}", headers={"If-None-Match": f"W/{etag}"})
+    listed = api.get(f"{BOOKS}{book['id']}", headers={"If-None-Match": f'"other", {etag}'})
+    star = api.get(f"{BOOKS}{book['id']}", headers={"If-None-Match": "*"})
+
+    assert weak.status_code == listed.status_code == star.status_code == 304
+
+
+def test_update_changes_the_book_etag(api, create_book):
+    book = create_book()
+    etag = api.get(f"{BOOKS}{book['id']}").headers["ETag"]
+    api.patch(f"{BOOKS}{book['id']}", json={"title": "Changed"})
+
+    response = api.get(f"{BOOKS}{book['id']}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Changed"
+    assert response.headers["ETag"] != etag
+
+
+def test_sparse_representation_has_its_own_etag(api, create_book):
+    book = create_book()
+    full = api.get(f"{BOOKS}{book['id']}").headers["ETag"]
+    sparse = api.get(f"{BOOKS}{book['id']}", params={"fields": "id,title"})
+
+    assert sparse.headers["ETag"] != full
+    assert sparse.json() == {"id": book["id"], "title": book["title"]}
+    # The full representation's ETag does not validate the sparse one
+    response = api.get(f"{BOOKS}{book['id']}", params={"fields": "id,title"}, headers={"If-None-Match": full})
+    assert response.status_code == 200
+
+
+def test_if_modified_since_revalidates_with_304(api, create_book):
+    book = create_book()
+    last_modified = api.get(f"{BOOKS}{book['id']}").headers["Last-Modified"]
+
+    current = api.get(f"{BOOKS}{book['id']}", headers={"If-Modified-Since": last_modified})
+    stale = api.get(f"{BOOKS}{book['id']}", headers={"If-Modified-Since": LONG_AGO})
+
+    assert current.status_code == 304
+    assert stale.status_code == 200
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(api, create_book):
+    book = create_book()
+    last_modified = api.get(f"{BOOKS}{book['id']}").headers["Last-Modified"]
+
+    response = api.get(
+        f"{BOOKS}{book['id']}",
+        headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified},
+    )
+
+    assert response.status_code == 200
+
+
+def test_list_etag_revalidates_until_the_page_changes(api, create_book):
+    book = create_book()
+    first = api.get(BOOKS, params={"limit": 10})
+
+    unchanged = api.get(BOOKS, params={"limit": 10}, headers={"If-None-Match": first.headers["ETag"]})
+    api.patch(f"{BOOKS}{book['id']}", json={"title": "Changed"})
+    changed = api.get(BOOKS, params={"limit": 10}, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.json()[0]["title"] == "Changed"
+
+
+def test_list_etag_depends_on_the_query(api, create_book):
+    create_book()
+
+    default = api.get(BOOKS).headers["ETag"]
+    sparse = api.get(BOOKS, params={"fields": "id"}).headers["ETag"]
+
+    assert default != sparse
+
@@ -0,0 +1,200 @@
+"""
+Tests for app.core.idempotency
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+pytestmark = pytest.mark.anyio
+
+
+def build_app(store: IdempotencyStore, release: asyncio.Event = None, status_code: int = 201):
+    """
+    A one-route app counting how often its POST handler really runs
+    """
+    calls = []
+
+    async def create(request: Request):
+        body = await request.json()
+        calls.append(body)
+        if release is not None:
+            await release.wait()
+        return JSONResponse({"call": len(calls), **body}, status_code=status_code)
+
+    app = Starlette(routes=[Route("/books", create, methods=["POST"])])
+    return IdempotencyMiddleware(app, paths=["/books"], store=store), calls
+
+
+def new_store(**overrides) -> IdempotencyStore:
+    options = {"max_keys": 100, "ttl_seconds": 60.0, "wait_timeout_seconds": 5.0, **overrides}
+    return IdempotencyStore(**options)
+
+
+def client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_retry_replays_stored_status_and_body():
+    store = new_store()
+    app, calls = build_app(store)
+    async with client(app) as http:
+        first = await http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+        retry = await http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.content == first.content
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert len(calls) == 1
+    assert store.stats()["replays"] == 1
+
+
+async def test_same_key_with_different_body_is_rejected():
+    store = new_store()
+    app, calls = build_app(store)
+    async with client(app) as http:
+        await http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+        other = await http.post("/books", json={"title": "b"}, headers={"Idempotency-Key": "k1"})
+
+    assert other.status_code == 422
+    assert len(calls) == 1
+    assert store.stats()["mismatches"] == 1
+
+
+async def test_duplicate_in_flight_waits_for_the_original():
+    store = new_store()
+    release = asyncio.Event()
+    app, calls = build_app(store, release=release)
+    async with client(app) as http:
+        original = asyncio.ensure_future(
+            http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+        )
+        while not calls:
+            await asyncio.sleep(0)
+        duplicate = asyncio.ensure_future(
+            http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+        )
+        await asyncio.sleep(0.01)
+        assert not duplicate.done()
+        release.set()
+        first, second = await asyncio.gather(original, duplicate)
+
+    assert second.content == first.content
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert len(calls) == 1
+    assert store.stats()["waits"] == 1
+    assert store.stats()["in_flight"] == 0
+
+
+async def test_duplicate_gets_409_when_the_original_takes_too_long():
+    store = new_store(wait_timeout_seconds=0.01)
+    release = asyncio.Event()
+    app, calls = build_app(store, release=release)
+    async with client(app) as http:
+        original = asyncio.ensure_future(
+            http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+        )
+        while not calls:
+            await asyncio.sleep(0)
+        duplicate = await http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+        release.set()
+        await original
+
+    assert duplicate.status_code == 409
+    assert "Retry-After" in duplicate.headers
+    assert len(calls) == 1
+    assert store.stats()["wait_timeouts"] == 1
+
+
+async def test_expired_key_runs_the_request_again():
+    store = new_store(ttl_seconds=0.01)
+    app, calls = build_app(store)
+    async with client(app) as http:
+        await http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+        await asyncio.sleep(0.05)
+        again = await http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+
+    assert "Idempotent-Replayed" not in again.headers
+    assert len(calls) == 2
+
+
+async def test_server_errors_are_not_stored():
+    store = new_store()
+    app, calls = build_app(store, status_code=503)
+    async with client(app) as http:
+        await http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+        retry = await http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "k1"})
+
+    assert "Idempotent-Replayed" not in retry.headers
+    assert len(calls) == 2
+
+
+async def test_requests_without_a_key_are_not_deduplicated():
+    app, calls = build_app(new_store())
+    async with client(app) as http:
+        await http.post("/books", json={"title": "a"})
+        await http.post("/books", json={"title": "a"})
+
+    assert len(calls) == 2
+
+
+async def test_invalid_key_is_rejected():
+    app, calls = build_app(new_store())
+    async with client(app) as http:
+        response = await http.post("/books", json={"title": "a"}, headers={"Idempotency-Key": "x" * 256})
+
+    assert response.status_code == 400
+    assert calls == []
+
+
+async def test_oversized_response_is_not_stored():
+    store = new_store(max_body_bytes=64)
+    app, calls = build_app(store)
+    async with client(app) as http:
+        payload = {"title": "x" * 100}
+        first = await http.post("/books", json=payload, headers={"Idempotency-Key": "k1"})
+        retry = await http.post("/books", json=payload, headers={"Idempotency-Key": "k1"})
+
+    assert first.status_code == retry.status_code == 201
+    assert "Idempotent-Replayed" not in retry.headers
+    assert len(calls) == 2
+    assert store.stats()["size"] == 0
+    assert store.stats()["too_large"] == 2
+
+
+async def test_stored_bodies_are_bounded_by_the_byte_budget():
+    store = new_store(max_bytes=100)
+    app, calls = build_app(store)
+    async with client(app) as http:
+        for key in ("k1", "k2", "k3"):
+            await http.post("/books", json={"title": "x" * 20}, headers={"Idempotency-Key": key})
+        newest = await http.post("/books", json={"title": "x" * 20}, headers={"Idempotency-Key": "k3"})
+        oldest = await http.post("/books", json={"title": "x" * 20}, headers={"Idempotency-Key": "k1"})
+
+    assert newest.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in oldest.headers
+    assert store.stats()["bytes"] <= 100
+    assert store.stats()["evictions"] >= 1
+
+
+async def test_keys_are_scoped_to_the_caller():
+    store = new_store()
+    app, calls = build_app(store)
+    async with client(app) as http:
+        alice = {"Idempotency-Key": "k1", "Authorization": "Bearer alice"}
+        bob = {"Idempotency-Key": "k1", "Authorization": "Bearer bob"}
+        await http.post("/books", json={"title": "a"}, headers=alice)
+        other = await http.post("/books", json={"title": "a"}, headers=bob)
+        retry = await http.post("/books", json={"title": "a"}, headers=alice)
+
+    assert "Idempotent-Replayed" not in other.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert len(calls) == 2
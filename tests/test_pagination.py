@@ -0,0 +1,89 @@
+"""
+Tests for keyset cursor pagination of GET /books
+"""
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+BOOKS = "/api/v1/books/"
+
+
+def pages(api, **params):
+    """
+    Follow X-Next-Cursor from the first page to the last
+    """
+    seen = []
+    response = api.get(BOOKS, params=params)
+    while True:
+        assert response.status_code == 200, response.text
+        seen.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return seen
+        response = api.get(BOOKS, params={**params, "after": cursor})
+
+
+@pytest.mark.parametrize("order_desc", [False, True])
+def test_cursor_pages_cover_tied_sort_keys_exactly_once(api, create_book, order_desc):
+    # Three titles shared by nine books: pages end in the middle of ties
+    books = [create_book(title=f"Title {n % 3}") for n in range(9)]
+
+    result = pages(api, order_by="title", order_desc=order_desc, limit=2)
+
+    ids = [book["id"] for page in result for book in page]
+    expected = sorted(books, key=lambda book: (book["title"], book["id"]), reverse=order_desc)
+    assert ids == [book["id"] for book in expected]
+    assert len(result) == 5
+
+
+def test_last_page_has_no_cursor(api, create_book):
+    for _ in range(2):
+        create_book()
+
+    response = api.get(BOOKS, params={"limit": 2})
+
+    assert len(response.json()) == 2
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_cursor_for_another_sort_order_is_rejected(api, create_book):
+    for _ in range(3):
+        create_book()
+    cursor = api.get(BOOKS, params={"order_by": "title", "limit": 1}).headers["X-Next-Cursor"]
+
+    response = api.get(BOOKS, params={"order_by": "author", "after": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Pagination cursor does not match the requested sort order"
+
+
+@pytest.mark.parametrize("after", [
+    "not a cursor",
+    encode_cursor({"order_by": "title", "order_desc": False, "id": 1}),
+    encode_cursor({"order_by": "title", "order_desc": False, "key": {"a": 1}, "id": 1}),
+    encode_cursor({"order_by": "title", "order_desc": False, "key": ["a"], "id": 1}),
+    encode_cursor({"order_by": "title", "order_desc": False, "key": 3, "id": 1}),
+    encode_cursor({"order_by": "title", "order_desc": False, "key": None, "id": 1}),
+    encode_cursor({"order_by": "title", "order_desc": False, "key": "a", "id": "1"}),
+    encode_cursor({"order_by": "title", "order_desc": False, "key": "a", "id": True}),
+    encode_cursor({"order_by": "id", "order_desc": False, "key": 1.5, "id": 1}),
+], ids=["garbage", "no-key", "dict-key", "list-key", "int-title", "null-title", "str-id", "bool-id", "float-id"])
+def test_malformed_cursor_is_rejected(api, create_book, after):
+    create_book()
+    order_by = decode_cursor(after)["order_by"] if after != "not a cursor" else "title"
+
+    response = api.get(BOOKS, params={"order_by": order_by, "after": after})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+
+def test_skip_cannot_be_combined_with_a_cursor(api, create_book):
+    for _ in range(2):
+        create_book()
+    cursor = api.get(BOOKS, params={"limit": 1}).headers["X-Next-Cursor"]
+
+    response = api.get(BOOKS, params={"skip": 1, "after": cursor})
+
+    assert response.status_code == 400